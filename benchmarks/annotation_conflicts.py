@@ -0,0 +1,109 @@
+"""Time the annotation conflict pass for growing numbers of labels
+
+Usage: python annotation_conflicts.py [--counts 10 100 1000 10000] [--greedy-limit N] [--budget SECONDS]
+       Runs from any directory and imports lifegraph from the checkout this file is in, no PYTHONPATH needed
+
+Labels are generated with a fixed seed and given bounding boxes similar to an A4 graph,
+so no text has to be measured. The greedy pass is skipped above --greedy-limit labels.
+With --budget, the leader lines that cross are counted after the default placement and
+after resolve_annealing is given that many seconds per column.
+"""
+from datetime import date
+import argparse
+import os
+import random
+import sys
+import time
+
+# benchmark the checkout this file is in, not an installed copy
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lifegraph.lifegraph import Annotation, Extent, Point  # noqa: E402
+from lifegraph import placement  # noqa: E402
+
+
+def make_annotations(count, seed=0, max_age=90):
+    """Returns two columns of labels with bounding boxes, sorted like Lifegraph sorts them"""
+    rng = random.Random(seed)
+    left = []
+    right = []
+    for _ in range(count):
+        week = rng.randint(1, 52)
+        year = rng.randint(0, max_age - 1)
+        width = rng.uniform(4, 14)
+        height = 1.4 * rng.choice([1, 1, 1, 2])
+        if week < 26:
+            x = -3.5 - width
+            column = left
+        else:
+            x = 55
+            column = right
+        a = Annotation(date(2000, 1, 1), "label", Point(x, year), event_point=Point(week, year))
+        a.set_bbox(Extent(x, year + height / 2, x + width, year - height / 2))
+        column.append(a)
+    left.sort(key=lambda a: (a.event_point.y, a.event_point.x))
+    right.sort(key=lambda a: (a.event_point.y, -a.event_point.x))
+    return left, right
+
+
+def count_crossings(column):
+    """Returns the number of pairs of leader lines of a column that cross"""
+    import numpy as np
+
+    ax = np.array([a.bbox.xmin + a.relpos[0] * (a.bbox.xmax - a.bbox.xmin) for a in column])
+    ay = np.array([a.bbox.ymax - a.relpos[1] * (a.bbox.ymax - a.bbox.ymin) for a in column])
+    ex = np.array([a.event_point.x for a in column], dtype=float)
+    ey = np.array([a.event_point.y for a in column], dtype=float)
+    return sum(int(placement._crossings(ax, ay, ex, ey, i).sum()) for i in range(len(column))) // 2
+
+
+def compare_annealing(count, epsilon, budget):
+    """Prints the crossings of the default placement and of resolve_annealing"""
+    results = []
+    for optimize in (False, True):
+        left, right = make_annotations(count)
+        for a in left:
+            a.set_relpos((1, 0.5))
+        for a in right:
+            a.set_relpos((0, 0.5))
+        start = time.perf_counter()
+        if optimize:
+            columns = [placement.resolve_annealing(c, epsilon, deadline=time.perf_counter() + budget, limits=(-3, 93))
+                       for c in (left, right)]
+        else:
+            columns = [placement.resolve_conflicts(c, epsilon) for c in (left, right)]
+        results.append((sum(count_crossings(c) for c in columns), time.perf_counter() - start))
+    (before, _), (after, elapsed) = results
+    print(f"{count:>8}{before:>12}{after:>12}{elapsed:>12.2f}")
+
+
+def time_resolve(resolve, count, epsilon):
+    """Returns the time, in seconds, to resolve both columns"""
+    left, right = make_annotations(count)
+    start = time.perf_counter()
+    resolve(left, epsilon)
+    resolve(right, epsilon)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--epsilon", type=float, default=0.2)
+    parser.add_argument("--greedy-limit", type=int, default=2000)
+    parser.add_argument("--budget", type=float, default=None)
+    args = parser.parse_args()
+
+    print(f"{'labels':>8}{'greedy':>12}{'indexed':>12}{'default':>12}")
+    for count in args.counts:
+        greedy = time_resolve(placement.resolve_greedy, count, args.epsilon) if count <= args.greedy_limit else None
+        indexed = time_resolve(placement.resolve_indexed, count, args.epsilon)
+        default = time_resolve(placement.resolve_conflicts, count, args.epsilon)
+        greedy = f"{greedy:>12.4f}" if greedy is not None else f"{'skipped':>12}"
+        print(f"{count:>8}{greedy}{indexed:>12.4f}{default:>12.4f}")
+
+    if args.budget is not None:
+        print()
+        print(f"{'labels':>8}{'crossings':>12}{'annealed':>12}{'seconds':>12}")
+        for count in args.counts:
+            compare_annealing(count, args.epsilon, args.budget)
@@ -0,0 +1,56 @@
+"""Compare the time it takes to save an empty grid with each GridMode for every Papersize
+
+Usage: python grid_mode.py [--dpi DPI] [--repeat N] [--format png|pdf|svg] [--no-usetex]
+       Runs from any directory and imports lifegraph from the checkout this file is in, no PYTHONPATH needed
+
+With a vector format the size of each file is printed after the times.
+"""
+from datetime import date
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+
+# benchmark the checkout this file is in, not an installed copy
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lifegraph.lifegraph import Lifegraph, Papersize, GridMode  # noqa: E402
+
+
+def time_save(size, grid_mode, dpi, repeat, usetex, fmt):
+    """Returns the best time, in seconds, of saving a grid and the size of the file in bytes"""
+    best = None
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, f"grid.{fmt}")
+        for _ in range(repeat):
+            g = Lifegraph(date(1990, 11, 1), size=size, dpi=dpi, grid_mode=grid_mode)
+            g.settings.rcParams["text.usetex"] = usetex
+            start = time.perf_counter()
+            g.save(name)
+            elapsed = time.perf_counter() - start
+            g.close()
+            best = elapsed if best is None else min(best, elapsed)
+        return best, os.path.getsize(name)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--format", choices=["png", "pdf", "svg"], default="png")
+    parser.add_argument("--no-usetex", action="store_true",
+                        help="render text without LaTeX, for machines that do not have it installed")
+    args = parser.parse_args()
+
+    sizes = args.format != "png"
+    print(f"{'papersize':<12}" + "".join(f"{m.name:>10}" for m in GridMode) + f"{'speedup':>10}"
+          + ("".join(f"{m.name + ' KB':>12}" for m in GridMode) if sizes else ""))
+    for sz in Papersize:
+        results = {m: time_save(sz, m, args.dpi, args.repeat, not args.no_usetex, args.format) for m in GridMode}
+        speedup = results[GridMode.LINES][0] / results[GridMode.MARKERS][0]
+        print(f"{sz.name:<12}" + "".join(f"{t:>10.3f}" for t, _ in results.values()) + f"{speedup:>10.2f}"
+              + ("".join(f"{n / 1024:>12.0f}" for _, n in results.values()) if sizes else ""))
@@ -0,0 +1,67 @@
+"""Measure how long it takes to import lifegraph and check that it does not load matplotlib
+
+Usage: python import_time.py [--repeat N] [--max-ms MS]
+       Runs from any directory and imports lifegraph from the checkout this file is in, no PYTHONPATH needed
+
+Each run is a fresh interpreter that imports lifegraph.lifegraph and describes a graph without
+drawing it. The script fails if matplotlib, numpy or dateutil were imported along the way, or if
+the best time is over --max-ms.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# benchmark the checkout this file is in, not an installed copy, the interpreters it starts get it on PYTHONPATH
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+heavy = ("matplotlib", "numpy", "dateutil")
+
+program = f"""
+import json, sys, time
+start = time.perf_counter()
+import lifegraph.lifegraph as lg
+imported = time.perf_counter() - start
+
+from datetime import date
+g = lg.Lifegraph(date(1990, 11, 1))
+g.add_life_event("Married", date(2010, 2, 14), color="r")
+g.add_era("College", date(2009, 9, 1), date(2013, 12, 14), color="b")
+g.add_era_span("Pregnant", date(2016, 1, 22), date(2016, 10, 16), color="g")
+described = time.perf_counter() - start
+
+print(json.dumps({{"import": imported, "describe": described,
+                  "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_once():
+    """Returns the import time, describe time and heavy modules of a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    p = subprocess.run([sys.executable, "-c", program], capture_output=True, text=True, env=env, check=True)
+    return json.loads(p.stdout.splitlines()[-1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if importing takes longer than this")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.repeat)]
+    best_import = min(r["import"] for r in runs) * 1000
+    best_describe = min(r["describe"] for r in runs) * 1000
+    loaded = sorted({m for r in runs for m in r["heavy"]})
+
+    print(f"import lifegraph.lifegraph  {best_import:8.1f}ms")
+    print(f"import and describe a graph {best_describe:8.1f}ms")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: {', '.join(loaded)} imported before drawing")
+        failed = True
+    if args.max_ms is not None and best_import > args.max_ms:
+        print(f"FAIL: importing took more than {args.max_ms}ms")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,75 @@
+"""Measure the memory used to store the events of a graph
+
+Usage: python memory.py [--counts 1000 10000 100000] [--layout]
+       Runs from any directory and imports lifegraph from the checkout this file is in, no PYTHONPATH needed
+
+Events are added with Lifegraph.add_life_events and the memory allocated for them is measured
+with tracemalloc. With --layout, every annotation is also given a bounding box like the layout
+does, and the size of a matplotlib Bbox is shown for comparison.
+"""
+from datetime import date, timedelta
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+from matplotlib.transforms import Bbox
+
+# benchmark the checkout this file is in, not an installed copy
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lifegraph.lifegraph import Extent, Lifegraph  # noqa: E402
+
+
+def make_dates(count, birthdate, seed=0, max_age=90):
+    """Returns count random dates within max_age years of birthdate"""
+    rng = random.Random(seed)
+    return [birthdate + timedelta(days=rng.randint(0, (max_age - 1) * 365)) for _ in range(count)]
+
+
+def measure(count, layout):
+    """Returns the bytes allocated per event, and per bounding box if layout is True"""
+    birthdate = date(1990, 11, 1)
+    dates = make_dates(count, birthdate)
+    texts = [f"event {i}" for i in range(count)]
+    g = Lifegraph(birthdate)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    g.add_life_events(texts, dates, colors="black")
+    events = tracemalloc.get_traced_memory()[0] - before
+
+    boxes = None
+    if layout:
+        before = tracemalloc.get_traced_memory()[0]
+        for a in g.annotations:
+            a.set_bbox(Extent(a.x, a.y + .7, a.x + 10, a.y - .7))
+        boxes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return events / count, None if boxes is None else boxes / count
+
+
+def bbox_size(count=10000):
+    """Returns the bytes allocated per matplotlib Bbox"""
+    tracemalloc.start()
+    boxes = [Bbox([[0, .7], [10, -.7]]) for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del boxes
+    return size / count
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--layout", action="store_true", help="also give every annotation a bounding box")
+    args = parser.parse_args()
+
+    print(f"{'events':>8}{'bytes/event':>14}{'bytes/bbox':>14}")
+    for count in args.counts:
+        events, boxes = measure(count, args.layout)
+        boxes = f"{boxes:>14.0f}" if boxes is not None else f"{'-':>14}"
+        print(f"{count:>8}{events:>14.0f}{boxes}")
+    if args.layout:
+        print(f"a matplotlib Bbox takes {bbox_size():.0f} bytes")
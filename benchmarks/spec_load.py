@@ -0,0 +1,73 @@
+"""Measure how fast specs are decoded and turned into graphs
+
+Usage: python spec_load.py [--count N] [--events N]
+       Runs from any directory and imports lifegraph from the checkout this file is in, no PYTHONPATH needed
+
+Builds --count specs like the ones a render farm queue holds, each with --events life events, a few
+eras and era spans, a title and a watermark. Every spec is encoded as a line of JSON, and with
+msgpack if it is installed, and the time to decode and build all of them is reported.
+"""
+from datetime import date, timedelta
+import argparse
+import os
+import random
+import sys
+import time
+
+# benchmark the checkout this file is in, not an installed copy
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lifegraph import spec as specs  # noqa: E402
+from lifegraph.lifegraph import Lifegraph  # noqa: E402
+
+
+def make_spec(rng, events):
+    """Returns the spec of a graph with random events"""
+    birthdate = date(1950, 1, 1) + timedelta(days=rng.randint(0, 50 * 365))
+    g = Lifegraph(birthdate, max_age=90, record_spec=True)
+
+    def day(years):
+        return birthdate + timedelta(days=rng.randint(0, years * 365))
+
+    g.add_title(f"Person {rng.randint(0, 10**6)}")
+    g.add_watermark("lifegraph")
+    for i in range(events):
+        g.add_life_event(f"Event {i}", day(89), color="#DC143C")
+    for i in range(3):
+        start = day(80)
+        g.add_era(f"Era {i}", start, start + timedelta(days=rng.randint(30, 3 * 365)), color="b")
+    for i in range(2):
+        start = day(80)
+        g.add_era_span(f"Span {i}", start, start + timedelta(days=rng.randint(30, 365)), color="g")
+    return g.to_spec()
+
+
+def run(encoded, label):
+    """Decode and build every spec and print the rate"""
+    start = time.perf_counter()
+    decoded = [specs.loads(data) for data in encoded]
+    decoding = time.perf_counter() - start
+    for spec in decoded:
+        specs.build(spec)
+    total = time.perf_counter() - start
+    size = sum(len(data) for data in encoded)
+    print(f"{label:<8}{len(encoded) / total:>10.0f} specs/s  decode {decoding:6.2f}s  build {total - decoding:6.2f}s"
+          f"  {size / len(encoded):8.0f} bytes/spec")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    spec_list = [make_spec(rng, args.events) for _ in range(args.count)]
+
+    run([specs.dumps(spec).encode() for spec in spec_list], "json")
+    try:
+        binary = [specs.dumps(spec, binary=True) for spec in spec_list]
+    except ValueError as e:
+        print(f"msgpack  skipped, {e}")
+    else:
+        run(binary, "msgpack")
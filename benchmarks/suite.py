@@ -0,0 +1,320 @@
+"""Run the benchmark suite and compare the results of two commits
+
+Usage: python suite.py run [--benchmarks ...] [--sizes ...] [--dpis ...] [--counts ...] [--no-usetex]
+       python suite.py compare BASE HEAD [--threshold 1.1]
+       Runs from any directory and imports lifegraph from the checkout this file is in, no PYTHONPATH needed
+
+Every case runs in a fresh process, which reports the best wall time of --repeat runs and the peak
+resident memory of the process. Each benchmark only varies the parameters it depends on, e.g.
+add_life_events runs for every count but not for every papersize.
+
+The results of a run are written to results/<commit>.json next to this file. compare takes two
+result files, or the commits they were written for, and prints the ratio of every case the two
+have in common, marking the ones slower than --threshold.
+
+A full run over every papersize, dpi and count up to 100000 events takes a long time, use the
+options to pick the cases you need. Labels cycle through a few hundred texts, so that the text
+metrics cache behaves like it would on a real graph.
+"""
+from datetime import date, timedelta
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+
+# benchmark the checkout this file is in, not an installed copy
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+birthdate = date(1990, 11, 1)
+max_age = 90
+
+
+def make_dates(count, seed=0, years=max_age - 1):
+    """Returns count random dates within years of the birthdate"""
+    rng = random.Random(seed)
+    return [birthdate + timedelta(days=rng.randint(0, years * 365)) for _ in range(count)]
+
+
+def make_spans(count, seed=0):
+    """Returns count random (start, end) pairs of at most three years"""
+    rng = random.Random(seed)
+    return [(d, d + timedelta(days=rng.randint(1, 3 * 365))) for d in make_dates(count, seed, years=max_age - 4)]
+
+
+def make_texts(count):
+    """Returns count label texts"""
+    return [f"Event {i % 300}" for i in range(count)]
+
+
+def new_graph(size="A4", dpi=100, usetex=True):
+    """Returns an empty Lifegraph"""
+    from lifegraph.lifegraph import Lifegraph, Papersize
+    g = Lifegraph(birthdate, size=Papersize[size], dpi=dpi, max_age=max_age)
+    g.settings.rcParams["text.usetex"] = usetex
+    return g
+
+
+def new_populated_graph(size, dpi, count, usetex):
+    """Returns a Lifegraph with count events, and an era and era span for every hundred events"""
+    g = new_graph(size, dpi, usetex)
+    g.add_life_events(make_texts(count), make_dates(count), colors="black")
+    for (start, end), text in zip(make_spans(count // 100 + 1, seed=1), make_texts(count // 100 + 1)):
+        g.add_era(text, start, end, color="b")
+    for (start, end), text in zip(make_spans(count // 100 + 1, seed=2), make_texts(count // 100 + 1)):
+        g.add_era_span(text, start, end, color="r")
+    return g
+
+
+# each benchmark takes its parameters and returns the function that is timed
+
+def bench_construct(size, dpi, usetex):
+    """Lifegraph()"""
+    return lambda: new_graph(size, dpi, usetex)
+
+
+def bench_add_life_event(count, usetex):
+    """Lifegraph.add_life_event once for every event"""
+    g = new_graph(usetex=usetex)
+    events = list(zip(make_texts(count), make_dates(count)))
+
+    def run():
+        for text, d in events:
+            g.add_life_event(text, d, "black")
+    return run
+
+
+def bench_add_life_events(count, usetex):
+    """Lifegraph.add_life_events with every event"""
+    g = new_graph(usetex=usetex)
+    texts = make_texts(count)
+    dates = make_dates(count)
+    return lambda: g.add_life_events(texts, dates, colors="black")
+
+
+def bench_add_era(count, usetex):
+    """Lifegraph.add_era once for every era"""
+    g = new_graph(usetex=usetex)
+    eras = list(zip(make_texts(count), make_spans(count)))
+
+    def run():
+        for text, (start, end) in eras:
+            g.add_era(text, start, end, "b")
+    return run
+
+
+def bench_add_era_span(count, usetex):
+    """Lifegraph.add_era_span once for every era span"""
+    g = new_graph(usetex=usetex)
+    spans = list(zip(make_texts(count), make_spans(count)))
+
+    def run():
+        for text, (start, end) in spans:
+            g.add_era_span(text, start, end, "r")
+    return run
+
+
+def bench_resolve(count, usetex):
+    """The annotation conflict pass over labels with known bounding boxes"""
+    from annotation_conflicts import make_annotations
+    from lifegraph import placement
+    left, right = make_annotations(count)
+
+    def run():
+        placement.resolve_conflicts(left, 0.2)
+        placement.resolve_conflicts(right, 0.2)
+    return run
+
+
+def bench_draw(size, dpi, count, usetex):
+    """Laying out the graph and adding every artist to the figure, without rendering it"""
+    g = new_populated_graph(size, dpi, count, usetex)
+
+    def run():
+        # the same steps as Lifegraph.save, up to the point where the figure is rendered
+        with g._Lifegraph__rc_context():
+            g._Lifegraph__draw()
+    return run
+
+
+def bench_save(size, dpi, count, usetex):
+    """Lifegraph.save to an in memory png"""
+    g = new_populated_graph(size, dpi, count, usetex)
+    return lambda: g.save(io.BytesIO())
+
+
+benchmarks = {
+    "construct": (bench_construct, ("size", "dpi")),
+    "add_life_event": (bench_add_life_event, ("count",)),
+    "add_life_events": (bench_add_life_events, ("count",)),
+    "add_era": (bench_add_era, ("count",)),
+    "add_era_span": (bench_add_era_span, ("count",)),
+    "resolve": (bench_resolve, ("count",)),
+    "draw": (bench_draw, ("size", "dpi", "count")),
+    "save": (bench_save, ("size", "dpi", "count")),
+}
+
+
+def peak_rss():
+    """Returns the peak resident memory of this process in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_case(case):
+    """Run one case in this process and return its result
+
+    :param case: A dict with the benchmark, its parameters, repeat and usetex
+
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+
+    bench, _ = benchmarks[case["benchmark"]]
+    best = None
+    for _ in range(case["repeat"]):
+        run = bench(usetex=case["usetex"], **case["params"])
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        del run
+    return {"time": best, "peak_rss": peak_rss()}
+
+
+def cases(args):
+    """Returns every case selected by the command line arguments"""
+    axes = {"size": args.sizes, "dpi": args.dpis, "count": args.counts}
+    for name in args.benchmarks:
+        _, params = benchmarks[name]
+        for values in itertools.product(*(axes[p] for p in params)):
+            yield {"benchmark": name, "params": dict(zip(params, values)), "repeat": args.repeat, "usetex": not args.no_usetex}
+
+
+def case_id(result):
+    """Returns a name for a case that is the same across runs"""
+    return result["benchmark"] + "".join(f" {k}={v}" for k, v in sorted(result["params"].items()))
+
+
+def git_commit():
+    """Returns the commit of the checkout, with -dirty appended if it has changes"""
+    def git(*a):
+        return subprocess.run(["git", *a], cwd=root, capture_output=True, text=True).stdout.strip()
+    commit = git("rev-parse", "HEAD") or "unknown"
+    if git("status", "--porcelain", "--untracked-files=no"):
+        commit += "-dirty"
+    return commit
+
+
+def run(args):
+    """Run every selected case in its own process and write the results"""
+    import matplotlib
+    import numpy
+
+    commit = git_commit()
+    results = []
+    for case in cases(args):
+        try:
+            p = subprocess.run([sys.executable, os.path.abspath(__file__), "case", json.dumps(case)],
+                               capture_output=True, text=True, timeout=args.timeout)
+            if p.returncode == 0:
+                case.update(json.loads(p.stdout.splitlines()[-1]))
+            else:
+                case["error"] = p.stderr.strip().splitlines()[-1] if p.stderr.strip() else f"exit code {p.returncode}"
+        except subprocess.TimeoutExpired:
+            case["error"] = f"timed out after {args.timeout}s"
+        results.append(case)
+
+        if "error" in case:
+            print(f"{case_id(case):<50}{case['error']}")
+        else:
+            print(f"{case_id(case):<50}{case['time']:>12.4f}s{case['peak_rss'] / 2**20:>10.1f}MB")
+
+    os.makedirs(results_dir, exist_ok=True)
+    path = args.output or os.path.join(results_dir, f"{commit}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "commit": commit,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "machine": {"platform": platform.platform(), "processor": platform.processor(), "cpus": os.cpu_count()},
+            "versions": {"python": platform.python_version(), "matplotlib": matplotlib.__version__, "numpy": numpy.__version__},
+            "results": results,
+        }, f, indent=1)
+    print(f"wrote {path}")
+
+
+def load_results(name):
+    """Load a result file given its path or the start of its commit"""
+    if not os.path.exists(name):
+        matches = sorted(f for f in os.listdir(results_dir) if f.startswith(name)) if os.path.isdir(results_dir) else []
+        if len(matches) != 1:
+            raise ValueError(f"'{name}' matches {len(matches)} result files in {results_dir}")
+        name = os.path.join(results_dir, matches[0])
+    with open(name) as f:
+        return json.load(f)
+
+
+def compare(args):
+    """Print the ratio of head to base for every case both of them ran"""
+    base = load_results(args.base)
+    head = load_results(args.head)
+    base_results = {case_id(r): r for r in base["results"] if "error" not in r}
+
+    print(f"{base['commit'][:12]} -> {head['commit'][:12]}")
+    print(f"{'case':<50}{'base':>10}{'head':>10}{'time':>8}{'rss':>8}")
+    regressions = 0
+    for r in head["results"]:
+        b = base_results.get(case_id(r))
+        if b is None or "error" in r:
+            continue
+        ratio = r["time"] / b["time"] if b["time"] else float("inf")
+        rss = r["peak_rss"] / b["peak_rss"] if b["peak_rss"] else float("inf")
+        slower = ratio > args.threshold or rss > args.threshold
+        regressions += slower
+        print(f"{case_id(r):<50}{b['time']:>10.4f}{r['time']:>10.4f}{ratio:>8.2f}{rss:>8.2f}" + ("  <-" if slower else ""))
+    print(f"{regressions} case(s) slower or bigger than {args.threshold}x")
+    return regressions
+
+
+if __name__ == '__main__':
+    from lifegraph.configuration import Papersize
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite")
+    run_parser.add_argument("--benchmarks", nargs="+", choices=list(benchmarks), default=list(benchmarks))
+    run_parser.add_argument("--sizes", nargs="+", choices=[s.name for s in Papersize], default=[s.name for s in Papersize])
+    run_parser.add_argument("--dpis", type=int, nargs="+", default=[100, 300])
+    run_parser.add_argument("--counts", type=int, nargs="+", default=[10, 1000, 100000])
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--timeout", type=float, default=600, help="seconds before a case is stopped")
+    run_parser.add_argument("--output", help="the result file, results/<commit>.json by default")
+    run_parser.add_argument("--no-usetex", action="store_true",
+                            help="render text without LaTeX, for machines that do not have it installed")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("base", help="a result file or the start of its commit")
+    compare_parser.add_argument("head", help="a result file or the start of its commit")
+    compare_parser.add_argument("--threshold", type=float, default=1.1)
+
+    case_parser = commands.add_parser("case", help=argparse.SUPPRESS)
+    case_parser.add_argument("case")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    elif args.command == "compare":
+        sys.exit(1 if compare(args) else 0)
+    else:
+        print(json.dumps(run_case(json.loads(args.case))))
@@ -0,0 +1,18 @@
+from lifegraph.lifegraph import Lifegraph, Papersize
+from lifegraph.batch import render_batch
+from datetime import date
+
+if __name__ == '__main__':
+    birthday = date(1990, 11, 1)
+
+    jobs = []
+    for sz in Papersize:
+        g = Lifegraph(birthday, dpi=300, size=sz)
+        g.add_title("Time is Not Equal to Money")
+        g.add_life_event('Married', date(2010, 2, 14), '#DC143C')
+        jobs.append((g, f"images/batch_{sz.name}.png"))
+
+    for result in render_batch(jobs):
+        print(result)
+        if not result.ok:
+            print(result.error)
@@ -0,0 +1,102 @@
+import gc
+import multiprocessing
+import os
+import time
+import traceback
+
+
+class RenderResult:
+    """The outcome of rendering one job of a batch"""
+
+    def __init__(self, index, name, elapsed, error=None):
+        """Initialize the RenderResult class
+
+        :param index: The position of the job in the list passed to render_batch
+        :param name: The name and location the graph was saved at
+        :param elapsed: The time in seconds it took to render the graph
+        :param error: (Default value = None) The formatted traceback if rendering failed
+
+        """
+        self.index = index
+        self.name = name
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def ok(self):
+        """True if the graph was saved"""
+        return self.error is None
+
+    def __repr__(self):
+        """Print a description of the RenderResult class"""
+        status = "ok" if self.ok else "failed"
+        return f"RenderResult {self.index} '{self.name}' {status} in {self.elapsed:.3f}s"
+
+    def __str__(self):
+        """Print a description of the RenderResult class"""
+        return self.__repr__()
+
+
+def _init_worker(max_memory):
+    """Internal, prepare a worker process for rendering
+
+    :param max_memory: The maximum address space of the worker in bytes or None
+
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+
+    if max_memory is not None:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+
+
+def _render(job):
+    """Internal, save a single graph inside of a worker
+
+    :param job: A tuple of (index, Lifegraph, name, keyword arguments for Lifegraph.save)
+
+    """
+    index, graph, name, save_kwargs = job
+    start = time.perf_counter()
+    error = None
+    try:
+        graph.save(name, **save_kwargs)
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        graph.close()
+        del graph
+        gc.collect()
+    return RenderResult(index, name, time.perf_counter() - start, error=error)
+
+
+def render_batch(jobs, processes=None, maxtasksperchild=50, max_memory=None, **save_kwargs):
+    """Save many graphs in parallel over a pool of processes
+
+    Each job is rendered in a worker process, so graphs never share matplotlib state. Workers are
+    replaced after maxtasksperchild jobs to return any memory matplotlib holds on to, and max_memory
+    caps the address space of each worker. A job that fails does not stop the batch, its error is
+    reported in its RenderResult.
+
+    :param jobs: An iterable of (Lifegraph, name) pairs. The graphs should not have been drawn yet
+    :param processes: (Default value = None) The number of worker processes, os.cpu_count() if None
+    :param maxtasksperchild: (Default value = 50) The number of jobs a worker renders before it is replaced
+    :param max_memory: (Default value = None) The maximum address space of each worker in bytes, only supported on POSIX systems
+    :param save_kwargs: Keyword arguments passed to every Lifegraph.save call, e.g. render_cache
+    :returns: A list of RenderResult in the same order as jobs
+
+    """
+    tasks = [(i, graph, name, save_kwargs) for i, (graph, name) in enumerate(jobs)]
+    if not tasks:
+        return []
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(tasks))
+
+    results = [None] * len(tasks)
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(max_memory,),
+                              maxtasksperchild=maxtasksperchild) as pool:
+        for result in pool.imap_unordered(_render, tasks, chunksize=1):
+            results[result.index] = result
+    return results
@@ -0,0 +1,366 @@
+from collections import OrderedDict
+import hashlib
+import math
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+
+def _key(*parts):
+    """Internal, build a cache key from everything that changes a cached file
+
+    :param parts: Values whose repr uniquely describes the file
+
+    """
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+class _ImageFiles:
+    """Internal, the directory an ImageCache keeps its decoded images in
+
+    Each image is stored as an uncompressed .npy file. Images are loaded memory mapped, so any
+    number of processes share one copy of an image in the page cache.
+    """
+
+    def __init__(self, directory):
+        """Initialize the _ImageFiles class
+
+        :param directory: The directory to keep the images in. It is created if it does not exist
+
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        """The location of the file for a key
+
+        :param key: A key returned by ImageCache.key
+
+        """
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def load(self, key):
+        """Return the memory mapped image stored for key or None if there is not one
+
+        :param key: A key returned by ImageCache.key
+
+        """
+        try:
+            return np.load(self.path(key), mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            # ValueError is raised for a file that another process has not finished writing
+            return None
+
+    def store(self, key, image):
+        """Store an image and return the memory mapped copy of it
+
+        The image is written to a temporary file first and moved into place, so other
+        processes never load a partially written image.
+
+        :param key: A key returned by ImageCache.key
+        :param image: A (height, width, channels) array of uint8
+
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(image, dtype=np.uint8))
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return self.load(key)
+
+
+class ImageCache:
+    """Decoded and resampled background images, see Lifegraph.add_image
+
+    An image is decoded once for every version of its file, which is told apart by its
+    modification time and size. For each pixel size it is drawn at, it is shrunk once to that
+    size, so matplotlib only has to resample an image about as large as the one it draws instead
+    of the full resolution photo. The most recently used images are kept in memory up to
+    max_bytes. If a directory is given, every decoded and resized image is also stored there as
+    an uncompressed .npy file and loaded memory mapped, so other processes skip decoding too.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 2**20):
+        """Initialize the ImageCache class
+
+        :param directory: (Default value = None) A directory to store the decoded images in. It is created if it does not exist
+        :param max_bytes: (Default value = 256 MB) The size of the images kept in memory
+
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.images = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._files = _ImageFiles(directory) if directory is not None else None
+
+    @staticmethod
+    def key(path, size=None):
+        """Build the key an image is stored under
+
+        :param path: The image file
+        :param size: (Default value = None) The (width, height) the image is resized to, None for the decoded image
+
+        """
+        st = os.stat(path)
+        return _key(os.path.abspath(path), st.st_mtime_ns, st.st_size, size)
+
+    def get(self, path, size=None):
+        """Return an image as a uint8 array, decoding and resizing it if it is not in the cache
+
+        :param path: The image file
+        :param size: (Default value = None) The (width, height) in pixels the image will be drawn at. The image is only made smaller, never larger, and is returned as decoded if None
+
+        """
+        if size is not None:
+            size = tuple(int(math.ceil(v)) for v in size)
+        key = self.key(path, size)
+        with self._lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        image = self._files.load(key) if self._files is not None else None
+        if image is None:
+            if size is None:
+                image = decode_image(path)
+            else:
+                image = resize_image(self.get(path), size)
+            if self._files is not None:
+                image = self._files.store(key, image)
+
+        with self._lock:
+            if key not in self.images:
+                self.images[key] = image
+                self.nbytes += image.nbytes
+            while self.nbytes > self.max_bytes and len(self.images) > 1:
+                _, old = self.images.popitem(last=False)
+                self.nbytes -= old.nbytes
+        return image
+
+    def clear(self):
+        """Forget every image kept in memory, the files in the directory are kept"""
+        with self._lock:
+            self.images.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __getstate__(self):
+        """Leave the lock and the images in memory out when the cache is pickled"""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["images"] = OrderedDict()
+        state["nbytes"] = 0
+        return state
+
+    def __setstate__(self, state):
+        """Recreate the lock when the cache is unpickled"""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class RenderCache:
+    """An on-disk cache of saved graphs, keyed on the fingerprint of the graph they were saved from
+
+    A hit is placed at the path being saved as a hard link to the cached file, or a copy where a
+    link isn't possible or link is False. Lifegraph.save replaces a linked file rather than
+    writing through it, other programs that change the files they are given in place should use
+    link=False. When the cache holds more than max_bytes or
+    max_entries, the least recently used files are removed until it is below nine tenths of the
+    limits. Any number of processes can share a cache directory.
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30, max_entries=None, link=True):
+        """Initialize the RenderCache class
+
+        :param directory: The directory to keep the saved files in. It is created if it does not exist
+        :param max_bytes: (Default value = 1 GB) The size of the files kept, or None for no limit
+        :param max_entries: (Default value = None) The number of files kept, or None for no limit
+        :param link: (Default value = True) Hard link hits instead of copying them
+
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.link = link
+        os.makedirs(directory, exist_ok=True)
+        # an estimate of the size of the cache, so that the directory is only scanned when it may be full
+        self._usage = None
+
+    @staticmethod
+    def key(fingerprint, extension, *options):
+        """Build the key a file is stored under
+
+        :param fingerprint: The value of Lifegraph.fingerprint
+        :param extension: The extension of the file, e.g. ".png"
+        :param options: The other arguments of Lifegraph.save that change the file
+
+        """
+        return _key(fingerprint, options) + extension
+
+    def path(self, key):
+        """The location of the file for a key
+
+        :param key: A key returned by RenderCache.key
+
+        """
+        return os.path.join(self.directory, key)
+
+    def fetch(self, key, name):
+        """Place the file stored for key at name
+
+        :param key: A key returned by RenderCache.key
+        :param name: The path the file should be placed at
+        :returns: False if there is no file for key
+
+        """
+        path = self.path(key)
+        try:
+            # the modification time orders the files for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        except PermissionError:
+            # another user's cache, it is still read
+            pass
+        directory = os.path.dirname(os.path.abspath(name))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            os.remove(tmp)
+            try:
+                if not self.link:
+                    raise OSError("copy")
+                os.link(path, tmp)
+            except OSError:
+                shutil.copyfile(path, tmp)
+            os.replace(tmp, name)
+        except FileNotFoundError:
+            # evicted by another process in the meantime
+            return False
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return True
+
+    def store(self, key, name):
+        """Copy a saved file into the cache and evict old files if it is full
+
+        :param key: A key returned by RenderCache.key
+        :param name: The path of the saved file
+
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f, open(name, "rb") as src:
+                shutil.copyfileobj(src, f)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+        if self._usage is None:
+            self._usage = self.usage()
+        else:
+            self._usage = (self._usage[0] + 1, self._usage[1] + os.path.getsize(self.path(key)))
+        if self.__full(*self._usage, 1):
+            self.evict()
+
+    def usage(self):
+        """The number of files in the cache and their size in bytes"""
+        entries = self.__entries()
+        return len(entries), sum(size for _, size, _ in entries)
+
+    def evict(self):
+        """Remove the least recently used files until the cache is below nine tenths of its limits"""
+        entries = sorted(self.__entries(), key=lambda e: e[0])
+        count, size = len(entries), sum(e[1] for e in entries)
+        for _, file_size, path in entries:
+            if not self.__full(count, size, .9):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            count -= 1
+            size -= file_size
+        self._usage = (count, size)
+
+    def clear(self):
+        """Remove every file in the cache"""
+        for _, _, path in self.__entries():
+            os.remove(path)
+        self._usage = (0, 0)
+
+    def __full(self, count, size, fraction):
+        """Internal, True if count files of size bytes are over a fraction of the limits"""
+        return ((self.max_entries is not None and count > self.max_entries * fraction)
+                or (self.max_bytes is not None and size > self.max_bytes * fraction))
+
+    def __entries(self):
+        """Internal, the (modification time, size, path) of every file in the cache"""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".tmp") or not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+
+def decode_image(path):
+    """Decode an image file with Pillow, the library matplotlib.image.imread uses
+
+    Grayscale, RGB and RGBA images are returned as they are stored, any other mode is converted
+    to RGBA.
+
+    :param path: The image file
+    :returns: A uint8 array of shape (height, width) or (height, width, channels)
+
+    """
+    from PIL import Image
+
+    with Image.open(path) as im:
+        if im.mode not in ("L", "RGB", "RGBA"):
+            im = im.convert("RGBA")
+        return np.asarray(im, dtype=np.uint8)
+
+
+def resize_image(image, size):
+    """Shrink an image to fit in a size, images that are already smaller are returned as they are
+
+    :param image: A uint8 array returned by decode_image
+    :param size: The (width, height) in pixels to shrink the image to
+
+    """
+    from PIL import Image
+
+    height, width = image.shape[:2]
+    size = (min(size[0], width), min(size[1], height))
+    if size == (width, height):
+        return image
+    return np.asarray(Image.fromarray(np.asarray(image)).resize(size, Image.LANCZOS, reducing_gap=3.0))
+
+
+# used by every Lifegraph that is not given its own cache
+default_image_cache = ImageCache()
+
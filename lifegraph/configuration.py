@@ -1,4 +1,7 @@
+from collections import ChainMap
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 
 class Papersize(Enum):
     """A class holding papersize in inches"""
@@ -21,1119 +24,272 @@ class Papersize(Enum):
     Tabloid = 17 #[17.0, 11.0] inches
 
 
+# the settings shared by every papersize, see _presets for the ones that differ
+_defaults = {
+    "rcParams": {
+        "axes.labelsize": 8,
+        "axes.labelcolor": "blue",
+        "axes.linewidth": 0.0,
+        "axes.spines.bottom": False,
+        "axes.spines.left": False,
+        "axes.spines.right": False,
+        "axes.spines.top": False,
+        "figure.titlesize": 20,
+        "font.size": 10,
+        "lines.linestyle": "none",
+        "lines.linewidth": 0.5,
+        "lines.marker": "s",
+        "lines.markeredgecolor": "black",
+        "lines.markeredgewidth": 0.5,
+        "lines.markerfacecolor": "none",
+        "lines.markersize": 3.0,
+        "markers.fillstyle": "none",
+        "savefig.pad_inches": 0.05,
+        "text.usetex": True,
+        "xtick.bottom": False,
+        "xtick.color": "black",
+        "xtick.labelsize": 5,
+        "xtick.labeltop": True,
+        "xtick.major.bottom": False,
+        "xtick.major.pad": -3,
+        "xtick.major.top": True,
+        "xtick.minor.bottom": False,
+        "xtick.minor.top": False,
+        "xtick.top": False,
+        "ytick.color": "black",
+        "ytick.labelsize": 5,
+        "ytick.left": False,
+        "ytick.major.left": True,
+        "ytick.major.pad": -4,
+        "ytick.major.right": False,
+        "ytick.minor.left": False,
+        "ytick.minor.right": False,
+        "ytick.right": False,
+    },
+    "otherParams": {
+        "xlabel.position": (0.2, 1.05),
+        "xlabel.color": None,  # defaults to "axes.labelcolor"
+        "xlabel.fontsize": None,  # defaults to "axes.labelsize"
+        "ylabel.position": (-0.03, 0.95),
+        "ylabel.color": None,  # defaults to "axes.labelcolor"
+        "ylabel.fontsize": None,  # defaults to "axes.labelsize"
+        "maxage.fontsize": 16,
+        "figure.title.yposition": 0.95,
+        "annotation.marker.size": 6.0,
+        "annotation.edge.width": 0.8,
+        "annotation.line.width": 1.0,
+        "annotation.shrinkA": 0,
+        #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
+        "annotation.left.offset": 6,
+        "annotation.right.offset": 5,
+        "era.span.linestyle": "-",
+        "era.span.markersize": 0,
+        "era.line.linewidth": 1,
+        "watermark.fontsize": 110,
+    },
+}
+
+# what each papersize changes from _defaults
+_presets = {
+    Papersize.A0: {
+        "rcParams": {
+            "axes.labelsize": 34, "figure.figsize": (33.1, 46.8), "figure.titlesize": 128, "font.size": 60,
+            "lines.linewidth": 1.0, "lines.markeredgewidth": 1.0, "lines.markersize": 12.0, "xtick.labelsize": 20,
+            "ytick.labelsize": 20,
+        },
+        "otherParams": {
+            "ylabel.position": (-0.02, 0.95), "maxage.fontsize": 38, "annotation.marker.size": 28.0,
+            "annotation.edge.width": 2.0, "annotation.line.width": 2.0, "annotation.left.offset": 3,
+            "annotation.right.offset": 3, "watermark.fontsize": 200,
+        },
+    },
+    Papersize.A1: {
+        "rcParams": {
+            "axes.labelsize": 26, "figure.figsize": (23.4, 33.1), "figure.titlesize": 42, "font.size": 28,
+            "lines.markersize": 9.0, "savefig.pad_inches": 0.25, "xtick.labelsize": 16, "ytick.labelsize": 16,
+        },
+        "otherParams": {"maxage.fontsize": 32, "annotation.marker.size": 18.0, "watermark.fontsize": 160},
+    },
+    Papersize.A2: {
+        "rcParams": {
+            "axes.labelsize": 16, "figure.figsize": (16.5, 23.4), "figure.titlesize": 42, "font.size": 28,
+            "lines.markersize": 6.0, "savefig.pad_inches": 0.25, "xtick.labelsize": 10, "ytick.labelsize": 10,
+        },
+        "otherParams": {"maxage.fontsize": 24, "figure.title.yposition": 0.98, "watermark.fontsize": 135},
+    },
+    Papersize.A3: {
+        "rcParams": {
+            "axes.labelsize": 16, "figure.figsize": (11.7, 16.5), "figure.titlesize": 28, "font.size": 18,
+            "lines.markersize": 4.5, "savefig.pad_inches": 0.25, "xtick.labelsize": 10, "ytick.labelsize": 10,
+        },
+        "otherParams": {"maxage.fontsize": 20, "annotation.marker.size": 8.0, "watermark.fontsize": 120},
+    },
+    Papersize.A4: {
+        "rcParams": {
+            "axes.labelsize": 12, "figure.figsize": (8.3, 11.7), "figure.titlesize": 24, "font.size": 16,
+            "xtick.labelsize": 10, "ytick.labelsize": 10,
+        },
+    },
+    Papersize.A5: {
+        "rcParams": {
+            "figure.figsize": (5.8, 8.3), "lines.markeredgewidth": 0.2, "lines.markersize": 2.0, "xtick.labelsize": 6,
+            "ytick.labelsize": 6,
+        },
+        "otherParams": {"maxage.fontsize": 10, "figure.title.yposition": 0.97, "watermark.fontsize": 90},
+    },
+    Papersize.A6: {
+        "rcParams": {
+            "axes.labelsize": 7, "figure.figsize": (4.1, 5.8), "figure.titlesize": 18, "font.size": 9,
+            "lines.linewidth": 0.3, "lines.markeredgewidth": 0.25, "lines.markersize": 1.25, "xtick.labelsize": 4,
+            "ytick.labelsize": 4,
+        },
+        "otherParams": {
+            "maxage.fontsize": 8, "figure.title.yposition": 0.97, "annotation.marker.size": 2.0,
+            "annotation.edge.width": 0.6, "annotation.line.width": 0.5, "era.line.linewidth": 0.5,
+            "watermark.fontsize": 70,
+        },
+    },
+    Papersize.A7: {
+        "rcParams": {
+            "axes.labelsize": 3, "figure.figsize": (2.9, 4.1), "figure.titlesize": 12, "font.size": 5,
+            "lines.linewidth": 0.2, "lines.markeredgewidth": 0.2, "lines.markersize": 1.0, "xtick.labelsize": 3,
+            "ytick.labelsize": 3,
+        },
+        "otherParams": {
+            "maxage.fontsize": 6, "annotation.marker.size": 2.0, "annotation.edge.width": 0.3,
+            "annotation.line.width": 0.5, "era.line.linewidth": 0.5, "watermark.fontsize": 50,
+        },
+    },
+    Papersize.A8: {
+        "rcParams": {
+            "axes.labelsize": 2, "figure.figsize": (2.0, 2.9), "figure.titlesize": 6, "font.size": 3,
+            "lines.linewidth": 0.2, "lines.markeredgewidth": 0.15, "lines.markersize": 0.6, "xtick.labelsize": 2,
+            "ytick.labelsize": 2,
+        },
+        "otherParams": {
+            "maxage.fontsize": 3, "annotation.marker.size": 1.8, "annotation.edge.width": 0.3,
+            "annotation.line.width": 0.3, "era.line.linewidth": 0.5, "watermark.fontsize": 35,
+        },
+    },
+    Papersize.A9: {
+        "rcParams": {
+            "axes.labelsize": 2, "figure.figsize": (1.5, 2.0), "figure.titlesize": 5, "font.size": 3,
+            "lines.linewidth": 0.2, "lines.markeredgewidth": 0.1, "lines.markersize": 0.54, "xtick.labelsize": 1,
+            "ytick.labelsize": 1,
+        },
+        "otherParams": {
+            "maxage.fontsize": 2, "annotation.marker.size": 1.2, "annotation.edge.width": 0.2,
+            "annotation.line.width": 0.2, "era.line.linewidth": 0.5, "watermark.fontsize": 30,
+        },
+    },
+    Papersize.A10: {
+        "rcParams": {
+            "axes.labelsize": 2, "figure.figsize": (1.0, 1.5), "figure.titlesize": 4, "font.size": 1,
+            "lines.markeredgewidth": 0.01, "lines.markersize": 0.5, "xtick.labelsize": 1, "ytick.labelsize": 1,
+        },
+        "otherParams": {
+            "ylabel.position": (-0.02, 0.95), "maxage.fontsize": 2, "annotation.marker.size": 0.001,
+            "annotation.edge.width": 0.1, "annotation.line.width": 0.1, "annotation.left.offset": 5,
+            "era.line.linewidth": 0.2, "watermark.fontsize": 18,
+        },
+    },
+    Papersize.HalfLetter: {
+        "rcParams": {"figure.figsize": (5.5, 8.5), "lines.markeredgewidth": 0.3, "lines.markersize": 1.5},
+        "otherParams": {"maxage.fontsize": 10, "watermark.fontsize": 90},
+    },
+    Papersize.Letter: {
+        "rcParams": {
+            "figure.figsize": (8.5, 11.0), "font.size": 12, "lines.markeredgewidth": 0.3, "savefig.pad_inches": 0.5,
+        },
+        "otherParams": {"maxage.fontsize": 12, "annotation.left.offset": 3, "annotation.right.offset": 3},
+    },
+    Papersize.Legal: {
+        "rcParams": {
+            "figure.figsize": (8.5, 14.0), "figure.titlesize": 24, "font.size": 12, "lines.markeredgewidth": 0.35,
+            "savefig.pad_inches": 0.5,
+        },
+        "otherParams": {"maxage.fontsize": 14, "annotation.left.offset": 3, "annotation.right.offset": 2},
+    },
+    Papersize.JuniorLegal: {
+        "rcParams": {
+            "figure.figsize": (5.0, 8.0), "lines.markeredgewidth": 0.35, "lines.markersize": 1.5,
+            "savefig.pad_inches": 0.5,
+        },
+        "otherParams": {
+            "maxage.fontsize": 10, "annotation.left.offset": 3, "annotation.right.offset": 2, "watermark.fontsize": 75,
+        },
+    },
+    Papersize.Ledger: {
+        "rcParams": {
+            "axes.labelsize": 12, "figure.figsize": (11.0, 17.0), "figure.titlesize": 24, "font.size": 18,
+            "lines.markeredgewidth": 0.4, "lines.markersize": 4.0, "savefig.pad_inches": 0.5, "xtick.labelsize": 8,
+            "ytick.labelsize": 8,
+        },
+        "otherParams": {"annotation.marker.size": 10.0, "annotation.left.offset": 3, "annotation.right.offset": 2},
+    },
+    Papersize.Tabloid: {
+        "rcParams": {
+            "axes.labelsize": 10, "figure.figsize": (17.0, 11.0), "figure.titlesize": 22, "lines.markeredgewidth": 0.4,
+            "lines.markersize": 4.0, "savefig.pad_inches": 0.5, "xtick.labelsize": 8, "ytick.labelsize": 8,
+        },
+        "otherParams": {
+            "figure.title.yposition": 0.97, "annotation.marker.size": 10.0, "annotation.right.offset": 6,
+            "watermark.fontsize": 130,
+        },
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def _resolve(papersize):
+    """Internal, the rcParams and otherParams of a papersize as read-only mappings
+
+    Each papersize is only resolved once, every LifegraphParams of that size shares the result.
+
+    :param papersize: A Papersize
+
+    """
+    preset = _presets.get(papersize)
+    if preset is None:
+        raise ValueError("Unknown paper size")
+    return tuple(MappingProxyType({**_defaults[section], **preset.get(section, {})})
+                 for section in ("rcParams", "otherParams"))
+
+
+def _restore(papersize, rcParams, otherParams):
+    """Internal, recreate a pickled LifegraphParams
+
+    :param papersize: A Papersize
+    :param rcParams: The rcParams that were changed from the defaults
+    :param otherParams: The otherParams that were changed from the defaults
+
+    """
+    params = LifegraphParams(papersize)
+    params.rcParams.update(rcParams)
+    params.otherParams.update(otherParams)
+    return params
+
+
 class LifegraphParams:
-    """A class that defines the defaults for drawing by papersize"""
+    """A class that defines the defaults for drawing by papersize
+
+    The defaults of a papersize are built once from _defaults and _presets and shared by every
+    instance. rcParams and otherParams are ChainMaps whose first map holds what was changed on
+    this instance, like the dpi or the axis labels, so a change never touches the shared defaults.
+    """
 
     def __init__(self, papersize):
-        d = None
-        if papersize == Papersize.A0:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 34,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [33.1, 46.8],
-                    "figure.titlesize": 128,
-                    "font.size": 60,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 1.0,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 1.00,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 12.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.05,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 20,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 20,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.02, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 38,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 28.0,
-                    "annotation.edge.width": 2.0,
-                    "annotation.line.width": 2.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 3,
-                    "annotation.right.offset": 3,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 200
-                }
-            }
-        elif papersize == Papersize.A1:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 26,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [23.4, 33.1],
-                    "figure.titlesize": 42,
-                    "font.size": 28,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.50,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 9.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.25,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 16,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 16,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 32,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 18.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 160
-                }
-            }
-        elif papersize == Papersize.A2:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 16,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [16.5, 23.4],
-                    "figure.titlesize": 42,
-                    "font.size": 28,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.50,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 6.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.25,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 10,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 10,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 24,
-                    "figure.title.yposition": 0.98,
-                    "annotation.marker.size": 6.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 135
-                }
-            }
-        elif papersize == Papersize.A3:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 16,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [11.7, 16.5],
-                    "figure.titlesize": 28,
-                    "font.size": 18,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.50,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 4.5,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.25,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 10,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 10,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 20,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 8.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 120
-                }
-            }
-        elif papersize == Papersize.A4:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 12,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [8.3, 11.7],
-                    "figure.titlesize": 24,
-                    "font.size": 16,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.50,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 3.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.05,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 10,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 10,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 16,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 6.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 110
-                }
-            }
-        elif papersize == Papersize.A5:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 8,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [5.8, 8.3],
-                    "figure.titlesize": 20,
-                    "font.size": 10,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.20,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 2.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.05,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 6,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 6,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 10,
-                    "figure.title.yposition": 0.97,
-                    "annotation.marker.size": 6.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 90
-                }
-            }
-        elif papersize == Papersize.A6:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 7,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [4.1, 5.8],
-                    "figure.titlesize": 18,
-                    "font.size": 9,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.3,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.25,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 1.25,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.05,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 4,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 4,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 8,
-                    "figure.title.yposition": 0.97,
-                    "annotation.marker.size": 2.0,
-                    "annotation.edge.width": 0.6,
-                    "annotation.line.width": 0.5,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 0.5,
-                    "watermark.fontsize": 70
-                }
-            }
-        elif papersize == Papersize.A7:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 3,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [2.9, 4.1],
-                    "figure.titlesize": 12,
-                    "font.size": 5,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.2,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.20,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 1.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.05,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 3,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 3,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 6,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 2.0,
-                    "annotation.edge.width": 0.3,
-                    "annotation.line.width": 0.5,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 0.5,
-                    "watermark.fontsize": 50
-                }
-            }
-        elif papersize == Papersize.A8:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 2,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [2.0, 2.9],
-                    "figure.titlesize": 6,
-                    "font.size": 3,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.2,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.15,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 0.6,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.05,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 2,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 2,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 3,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 1.8,
-                    "annotation.edge.width": 0.3,
-                    "annotation.line.width": 0.3,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 0.5,
-                    "watermark.fontsize": 35
-                }
-            }
-        elif papersize == Papersize.A9:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 2,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [1.5, 2.0],
-                    "figure.titlesize": 5,
-                    "font.size": 3,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.2,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.10,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 0.54,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.05,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 1,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 1,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 2,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 1.2,
-                    "annotation.edge.width": 0.2,
-                    "annotation.line.width": 0.2,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 0.5,
-                    "watermark.fontsize": 30
-                }
-            }
-        elif papersize == Papersize.A10:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 2,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [1.0, 1.5],
-                    "figure.titlesize": 4,
-                    "font.size": 1,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.01,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 0.50,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.05,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 1,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 1,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.02, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 2,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": .001,
-                    "annotation.edge.width": 0.1,
-                    "annotation.line.width": 0.1,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 5,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": .2,
-                    "watermark.fontsize": 18
-                }
-            }
-        elif papersize == Papersize.HalfLetter:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 8,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [5.5, 8.5],
-                    "figure.titlesize": 20,
-                    "font.size": 10,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.30,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 1.5,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.05,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 5,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 5,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 10,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 6.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 5,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 90
-                }
-            }
-        elif papersize == Papersize.Letter:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 8,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [8.5, 11.0],
-                    "figure.titlesize": 20,
-                    "font.size": 12,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.30,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 3.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.50,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 5,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 5,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 12,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 6.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 3,
-                    "annotation.right.offset": 3,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 110
-                }
-            }
-        elif papersize == Papersize.Legal:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 8,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [8.5, 14.0],
-                    "figure.titlesize": 24,
-                    "font.size": 12,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.35,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 3.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.50,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 5,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 5,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 14,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 6.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 3,
-                    "annotation.right.offset": 2,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 110
-                }
-            }
-        elif papersize == Papersize.JuniorLegal:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 8,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [5.0, 8.0],
-                    "figure.titlesize": 20,
-                    "font.size": 10,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.35,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 1.5,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.50,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 5,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 5,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 10,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 6.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 3,
-                    "annotation.right.offset": 2,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 75
-                }
-            }
-        elif papersize == Papersize.Ledger:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 12,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [11.0, 17.0],
-                    "figure.titlesize": 24,
-                    "font.size": 18,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.40,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 4.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.50,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 8,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 8,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 16,
-                    "figure.title.yposition": 0.95,
-                    "annotation.marker.size": 10.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 3,
-                    "annotation.right.offset": 2,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 110
-                }
-            }
-        elif papersize == Papersize.Tabloid:
-            d = {
-                "rcParams": {
-                    "axes.labelsize": 10,
-                    "axes.labelcolor": 'blue',
-                    "axes.linewidth": 0.0,
-                    "axes.spines.bottom": False,
-                    "axes.spines.left": False,
-                    "axes.spines.right": False,
-                    "axes.spines.top": False,
-                    "figure.figsize": [17.0, 11.0],
-                    "figure.titlesize": 22,
-                    "font.size": 10,
-                    "lines.linestyle": 'none',
-                    "lines.linewidth": 0.5,
-                    "lines.marker": 's',
-                    "lines.markeredgecolor": 'black',
-                    "lines.markeredgewidth": 0.40,
-                    "lines.markerfacecolor": 'none',
-                    "lines.markersize": 4.0,
-                    "markers.fillstyle": 'none',
-                    "savefig.pad_inches": 0.50,
-                    "text.usetex": True,
-                    "xtick.bottom": False,
-                    "xtick.color": "black",
-                    "xtick.labelsize": 8,
-                    "xtick.labeltop": True,
-                    "xtick.major.bottom": False,
-                    "xtick.major.pad": -3,
-                    "xtick.major.top": True,
-                    "xtick.minor.bottom": False,
-                    "xtick.minor.top": False,
-                    "xtick.top": False,
-                    "ytick.color": "black",
-                    "ytick.labelsize": 8,
-                    "ytick.left": False,
-                    "ytick.major.left": True,
-                    "ytick.major.pad": -4,
-                    "ytick.major.right": False,
-                    "ytick.minor.left": False,
-                    "ytick.minor.right": False,
-                    "ytick.right": False,
-                },
-                "otherParams": {
-                    "xlabel.position": (0.20, 1.05),
-                    "xlabel.color": None,  # defaults to "axes.labelcolor"
-                    "xlabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "ylabel.position": (-0.03, 0.95),
-                    "ylabel.color": None,  # defaults to "axes.labelcolor"
-                    "ylabel.fontsize": None,  # defaults to "axes.labelsize"
-                    "maxage.fontsize": 16,
-                    "figure.title.yposition": 0.97,
-                    "annotation.marker.size": 10.0,
-                    "annotation.edge.width": 0.8,
-                    "annotation.line.width": 1.0,
-                    "annotation.shrinkA": 0,
-                    #"annotation.shrinkB": 0, this is calculated, see the help for __draw_annotations
-                    "annotation.left.offset": 6,
-                    "annotation.right.offset": 6,
-                    "era.span.linestyle": "-",
-                    "era.span.markersize": 0,
-                    "era.line.linewidth": 1,
-                    "watermark.fontsize": 130
-                }
-            }
-        else:
-            raise ValueError("Unknown paper size")
+        """Initialize the LifegraphParams class
+
+        :param papersize: A Papersize
+
+        """
+        rcParams, otherParams = _resolve(papersize)
+        self.papersize = papersize
+        self.rcParams = ChainMap({}, rcParams)
+        self.otherParams = ChainMap({}, otherParams)
+        self.settings = {"rcParams": self.rcParams, "otherParams": self.otherParams}
 
-        self.settings = d
-        self.rcParams = d["rcParams"]
-        self.otherParams = d["otherParams"]
+    def __reduce__(self):
+        """Pickle the papersize and the changed settings, the shared defaults can't be pickled"""
+        return (_restore, (self.papersize, dict(self.rcParams.maps[0]), dict(self.otherParams.maps[0])))
@@ -0,0 +1,70 @@
+def add_years(day, years):
+    """The same day some years later, like adding a dateutil.relativedelta of years
+
+    The 29th of February becomes the 28th in years that are not leap years.
+
+    :param day: A datetime.date
+    :param years: The number of years to add
+
+    """
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+
+def to_days(dates):
+    """Convert dates to a NumPy array of datetime64[D]
+
+    :param dates: An array-like of datetime.date, datetime64 or anything else NumPy can convert to datetime64, e.g. a pandas column
+
+    """
+    import numpy as np
+
+    if hasattr(dates, "to_numpy"):
+        dates = dates.to_numpy()
+    return np.asarray(dates).astype("datetime64[D]")
+
+
+def year_starts(birthdate, first, last):
+    """The first day of every year of life from first to last, inclusive
+
+    The year of life starts on the birthday, a birthday on the 29th of February starts on the
+    28th in years that are not leap years.
+
+    :param birthdate: A datetime.date
+    :param first: The first year of life
+    :param last: The last year of life
+
+    """
+    import numpy as np
+
+    return np.array([add_years(birthdate, y) for y in range(first, last + 1)], dtype="datetime64[D]")
+
+
+def date_positions(birthdate, dates, weeks=52):
+    """Find the (week, year) square of many dates at once
+
+    This follows the same rules as placing a single date: the year is the number of whole 365 day
+    periods since the birthdate, and the week is counted from the birthday in that year.
+
+    :param birthdate: A datetime.date
+    :param dates: An array-like of dates, see to_days
+    :param weeks: (Default value = 52) The number of weeks in a row of the graph
+    :returns: A tuple of two int64 arrays, the week (x) and year (y) of each date
+
+    """
+    import numpy as np
+
+    days = to_days(dates)
+    if days.size == 0:
+        return np.zeros(days.shape, dtype=np.int64), np.zeros(days.shape, dtype=np.int64)
+
+    delta = (days - np.datetime64(birthdate, "D")).astype(np.int64)
+    year = delta // 365
+
+    first = int(year.min())
+    starts = year_starts(birthdate, first, int(year.max()))
+    week = (days - starts[year - first]).astype(np.int64) // 7
+
+    return week % weeks + 1, year
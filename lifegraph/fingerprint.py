@@ -0,0 +1,84 @@
+from enum import Enum
+import datetime
+import hashlib
+import json
+import os
+
+_source = None
+_files = {}
+
+
+def source_digest():
+    """A hash of the source of the lifegraph package, computed once per process
+
+    It stands in for a version number, so that a checkout with local changes doesn't match
+    files rendered before the change.
+    """
+    global _source
+    if _source is None:
+        h = hashlib.sha256()
+        package = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(package)):
+            if name.endswith(".py"):
+                with open(os.path.join(package, name), "rb") as f:
+                    h.update(name.encode() + b"\0" + f.read() + b"\0")
+        _source = h.hexdigest()
+    return _source
+
+
+def file_digest(path):
+    """A hash of the contents of a file, remembered until the file changes
+
+    :param path: The file to hash
+
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _files.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = _files[key] = h.hexdigest()
+    return digest
+
+
+def canonical(value):
+    """Turn a value into plain lists, dicts, strings and numbers that json can write the same way every time
+
+    Enums are written by name and dates in ISO 8601. The objects of the graph, like Annotation
+    and Era, are written as their class name and slots, leaving out the slots listed in their
+    _layout_slots, which are recomputed every time the graph is drawn.
+
+    :param value: Anything held by a Lifegraph
+
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{value.name}"
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, dict) or hasattr(value, "items"):
+        return {str(k): canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    slots = [s for cls in type(value).__mro__ for s in getattr(cls, "__slots__", ())]
+    if slots:
+        skip = getattr(type(value), "_layout_slots", ())
+        return [type(value).__name__, {s: canonical(getattr(value, s, None)) for s in slots if s not in skip}]
+    if hasattr(value, "tolist"):
+        # numpy scalars and arrays
+        return canonical(value.tolist())
+    return repr(value)
+
+
+def digest(state):
+    """The sha256 of the canonical json of a state
+
+    :param state: Anything canonical accepts
+
+    """
+    data = json.dumps(canonical(state), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode()).hexdigest()
@@ -0,0 +1,91 @@
+import numpy as np
+from matplotlib.artist import allow_rasterization
+from matplotlib.backends.backend_agg import RendererAgg
+from matplotlib.colors import to_rgba
+from matplotlib.lines import Line2D
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
+
+
+class SquareGrid(Line2D):
+    """A line of square markers, one per square of a grid, written to vector files as a single dashed path
+
+    The top and bottom edges of a row of squares are two dashed lines, one dash per square, and
+    the left and right edges of a column are two more. Every edge is a subpath of one path, so a
+    pdf or svg holds a few hundred line segments instead of a marker per square. Dashes restart
+    at the beginning of every subpath, so each line starts on the edge of its first square, and
+    projecting caps fill in the corners the same way the miter joins of a square marker do.
+
+    Agg already stamps markers quickly, and it snaps each one to the pixel grid, which spaces them
+    unevenly in a way dashes can't follow, so raster output is drawn as markers.
+    """
+
+    def __init__(self, columns, rows, **kwargs):
+        """Initialize the SquareGrid class
+
+        :param columns: The evenly spaced x coordinates of the columns, in data units
+        :param rows: The evenly spaced y coordinates of the rows, in data units
+        :param kwargs: Other arguments to Line2D
+
+        """
+        self.columns = np.asarray(columns, dtype=float)
+        self.rows = np.asarray(rows, dtype=float)
+        xs, ys = np.meshgrid(self.columns, self.rows)
+        super().__init__(xs.ravel(), ys.ravel(), **kwargs)
+
+    def __repr__(self):
+        """Print a description of the SquareGrid class"""
+        return f"SquareGrid({len(self.columns)}x{len(self.rows)} squares of {self.get_markersize()}pt)"
+
+    @allow_rasterization
+    def draw(self, renderer):
+        """Draw the grid as markers with Agg and as one dashed path with every other renderer
+
+        :param renderer: A matplotlib renderer
+
+        """
+        if isinstance(renderer, RendererAgg) or not self.get_visible() or not len(self.columns) or not len(self.rows):
+            return super().draw(renderer)
+
+        trans = self.get_transform()
+        px = trans.transform(np.column_stack([self.columns, np.full_like(self.columns, self.rows[0])]))[:, 0]
+        py = trans.transform(np.column_stack([np.full_like(self.rows, self.columns[0]), self.rows]))[:, 1]
+        size = self.get_markersize()
+        half = renderer.points_to_pixels(size) / 2
+        left, right = px.min() - half, px.max() + half
+        bottom, top = py.min() - half, py.max() + half
+
+        # every line is a moveto and a lineto
+        lines = [((left, y), (right, y)) for cy in py for y in (cy - half, cy + half)]
+        lines += [((x, bottom), (x, top)) for cx in px for x in (cx - half, cx + half)]
+        vertices = np.array(lines, dtype=float).reshape(-1, 2)
+        codes = np.tile([Path.MOVETO, Path.LINETO], len(lines)).astype(Path.code_type)
+
+        gc = renderer.new_gc()
+        self._set_gc_clip(gc)
+        gc.set_url(self.get_url())
+        gc.set_gid(self.get_gid())
+        gc.set_foreground(self.get_markeredgecolor(), isRGBA=False)
+        gc.set_alpha(self.get_alpha())
+        gc.set_linewidth(self.get_markeredgewidth())
+        gc.set_capstyle("projecting")
+        gc.set_joinstyle("miter")
+        # the graph has an equal aspect, so the rows are as far apart as the columns
+        distances = np.abs(np.diff(px if len(px) > 1 else py))
+        step = distances.mean() / renderer.points_to_pixels(1) if len(distances) else 0
+        if step > size:
+            gc.set_dashes(0, [size, step - size])
+        # otherwise the squares touch or overlap and their edges are solid lines
+        renderer.draw_path(gc, Path(vertices, codes), IdentityTransform())
+        gc.restore()
+        self.stale = False
+
+    @staticmethod
+    def supports(line):
+        """Returns True if the markers of a line are outlines of squares that a SquareGrid can draw as dashes
+
+        :param line: A Line2D
+
+        """
+        return (line.get_marker() == "s" and line.get_linestyle() in ("None", "none", "", " ")
+                and to_rgba(line.get_markerfacecolor())[3] == 0)
@@ -0,0 +1,313 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+from .dates import to_days
+from .lifegraph import Side
+
+# the kinds of rows the readers understand and the Lifegraph method each one is added with
+kinds = ("event", "era", "era_span")
+
+# the number of rows read into memory at a time
+default_chunksize = 10000
+
+
+class Chunk:
+    """A block of rows read from a file, stored by column
+
+    Every column is a list with one entry per row. Dates are ISO 8601 strings (YYYY-MM-DD),
+    optional values that are missing are None.
+    """
+
+    def __init__(self, first_row):
+        """Initialize the Chunk class
+
+        :param first_row: The number of the first row of the chunk in the file, counting from 1
+
+        """
+        self.first_row = first_row
+        self.kinds = []
+        self.texts = []
+        self.starts = []
+        self.ends = []
+        self.colors = []
+        self.sides = []
+
+    def append(self, kind, text, start, end=None, color=None, side=None):
+        """Add a row to the chunk
+
+        :param kind: One of kinds, "event" if empty
+        :param text: The label text
+        :param start: The date of an event or the start date of an era
+        :param end: (Default value = None) The end date of an era or era span
+        :param color: (Default value = None) A matplotlib color, a random color is chosen if None
+        :param side: (Default value = None) "left", "right" or None
+
+        """
+        self.kinds.append(kind or "event")
+        self.texts.append(text)
+        self.starts.append(start)
+        self.ends.append(end or None)
+        self.colors.append(color or None)
+        self.sides.append(side or None)
+
+    def __len__(self):
+        """The number of rows in the chunk"""
+        return len(self.texts)
+
+    def __repr__(self):
+        """Print a description of the Chunk class"""
+        return f"Chunk of {len(self)} rows starting at row {self.first_row}"
+
+    def __str__(self):
+        """Print a description of the Chunk class"""
+        return self.__repr__()
+
+
+def read_csv(path, chunksize=default_chunksize):
+    """Read the rows of a csv file in chunks
+
+    The first line names the columns. text and start are required, kind, end, color and side
+    are optional.
+
+    :param path: The csv file to read
+    :param chunksize: (Default value = default_chunksize) The number of rows in each chunk
+    :returns: A generator of Chunk
+
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = {name.strip(): i for i, name in enumerate(header)}
+        for required in ("text", "start"):
+            if required not in columns:
+                raise ValueError(f"{path} has no '{required}' column")
+
+        def column(row, name):
+            i = columns.get(name)
+            return row[i] if i is not None and i < len(row) else None
+
+        chunk = Chunk(1)
+        for row in reader:
+            if not row:
+                continue
+            chunk.append(column(row, "kind"), column(row, "text"), column(row, "start"), end=column(row, "end"),
+                         color=column(row, "color"), side=column(row, "side"))
+            if len(chunk) == chunksize:
+                yield chunk
+                chunk = Chunk(chunk.first_row + chunksize)
+        if len(chunk):
+            yield chunk
+
+
+def read_jsonl(path, chunksize=default_chunksize):
+    """Read the rows of a JSON Lines file in chunks
+
+    Every line is an object with the same keys as the columns of a csv file, see read_csv.
+
+    :param path: The JSON Lines file to read
+    :param chunksize: (Default value = default_chunksize) The number of rows in each chunk
+    :returns: A generator of Chunk
+
+    """
+    with open(path) as f:
+        chunk = Chunk(1)
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            chunk.append(row.get("kind"), row["text"], row["start"], end=row.get("end"),
+                         color=row.get("color"), side=row.get("side"))
+            if len(chunk) == chunksize:
+                yield chunk
+                chunk = Chunk(chunk.first_row + chunksize)
+        if len(chunk):
+            yield chunk
+
+
+def _ical_lines(f):
+    """Internal, unfold the lines of an iCalendar file, see RFC 5545 section 3.1
+
+    :param f: An open iCalendar file
+
+    """
+    current = None
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            current = (current or "") + line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _ical_date(value):
+    """Internal, turn an iCalendar DATE or DATE-TIME into an ISO 8601 date
+
+    :param value: e.g. 20100214 or 20100214T180000Z
+
+    """
+    return f"{value[0:4]}-{value[4:6]}-{value[6:8]}"
+
+
+def _ical_text(value):
+    """Internal, undo the escaping of an iCalendar TEXT value
+
+    :param value: The escaped text
+
+    """
+    return value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+
+def read_ical(path, chunksize=default_chunksize):
+    """Read the events of an iCalendar file in chunks
+
+    Every VEVENT is a row, its SUMMARY is the text and DTSTART is the start. A VEVENT that lasts
+    longer than a day becomes an era that ends on the last day it covers. The kind and side can be
+    set with the X-LIFEGRAPH-KIND and X-LIFEGRAPH-SIDE properties, and the color with COLOR.
+
+    :param path: The .ics file to read
+    :param chunksize: (Default value = default_chunksize) The number of rows in each chunk
+    :returns: A generator of Chunk
+
+    """
+    with open(path, newline="") as f:
+        chunk = Chunk(1)
+        event = None
+        for line in _ical_lines(f):
+            name, _, value = line.partition(":")
+            name, _, params = name.partition(";")
+            name = name.upper()
+            if name == "BEGIN" and value.upper() == "VEVENT":
+                event = {}
+            elif name == "END" and value.upper() == "VEVENT" and event is not None:
+                start = event.get("DTSTART")
+                end = event.get("DTEND")
+                kind = event.get("X-LIFEGRAPH-KIND")
+                if end is not None and start is not None:
+                    # DTEND is not part of the event, the last day is the one before it
+                    last = str(np.datetime64(end) - np.timedelta64(1, "D"))
+                    end = last if last > start else None
+                if kind is None:
+                    kind = "event" if end is None else "era"
+                chunk.append(kind, event.get("SUMMARY", ""), start, end=end,
+                             color=event.get("COLOR"), side=event.get("X-LIFEGRAPH-SIDE"))
+                event = None
+                if len(chunk) == chunksize:
+                    yield chunk
+                    chunk = Chunk(chunk.first_row + chunksize)
+            elif event is not None:
+                if name in ("DTSTART", "DTEND"):
+                    value = _ical_date(value)
+                elif name == "SUMMARY":
+                    value = _ical_text(value)
+                event[name] = value
+        if len(chunk):
+            yield chunk
+
+
+readers = {
+    ".csv": read_csv,
+    ".jsonl": read_jsonl,
+    ".ndjson": read_jsonl,
+    ".ics": read_ical,
+}
+
+
+def _to_days(chunk, dates, required):
+    """Internal, convert a column of a chunk to datetime64[D], reporting the rows of the chunk if it fails
+
+    :param chunk: The Chunk the dates were read into
+    :param dates: A column of ISO 8601 dates
+    :param required: A boolean array, True for every row that must have a date
+
+    """
+    try:
+        days = to_days(dates)
+    except ValueError as e:
+        raise ValueError(f"Rows {chunk.first_row} to {chunk.first_row + len(chunk) - 1}: {e}") from e
+    missing = np.isnat(days) & required
+    if missing.any():
+        raise ValueError(f"Row {chunk.first_row + int(missing.argmax())} is missing a date")
+    return days
+
+
+def _side(value):
+    """Internal, turn the side column into a Side
+
+    :param value: "left", "right" or None
+
+    """
+    if value is None:
+        return None
+    try:
+        return Side[value.strip().upper()]
+    except KeyError:
+        raise ValueError(f"The side must be 'left' or 'right', not '{value}'")
+
+
+def add_chunks(graph, chunks):
+    """Add the rows of chunks to a graph
+
+    The dates of each chunk are converted and checked against the dates the graph covers all at
+    once, and its events are added with a single Lifegraph.add_life_events call. Eras and era spans
+    are added after the events of their chunk. Only one chunk is held in memory at a time.
+
+    :param graph: A Lifegraph
+    :param chunks: An iterable of Chunk, e.g. from read_csv
+    :returns: The number of rows that were added
+
+    """
+    rows = 0
+    for chunk in chunks:
+        unknown = set(chunk.kinds).difference(kinds)
+        if unknown:
+            raise ValueError(f"Rows {chunk.first_row} to {chunk.first_row + len(chunk) - 1}: unknown kind {sorted(unknown)}")
+
+        is_event = np.array([kind == "event" for kind in chunk.kinds])
+        starts = _to_days(chunk, chunk.starts, np.ones(len(chunk), dtype=bool))
+        ends = _to_days(chunk, chunk.ends, ~is_event)
+        # checks the range of every date at once
+        graph.date_positions(starts)
+        graph.date_positions(ends[~is_event])
+        sides = [_side(s) for s in chunk.sides]
+
+        events = np.flatnonzero(is_event).tolist()
+        if events:
+            graph.add_life_events([chunk.texts[i] for i in events], starts[events],
+                                  colors=[chunk.colors[i] for i in events], side=[sides[i] for i in events])
+
+        for i in np.flatnonzero(~is_event).tolist():
+            start = starts[i].item()
+            end = ends[i].item()
+            if chunk.kinds[i] == "era":
+                graph.add_era(chunk.texts[i], start, end, color=chunk.colors[i], side=sides[i])
+            else:
+                graph.add_era_span(chunk.texts[i], start, end, color=chunk.colors[i], side=sides[i])
+
+        rows += len(chunk)
+    return rows
+
+
+def load(graph, path, chunksize=default_chunksize):
+    """Stream the events, eras and era spans of a file onto a graph
+
+    The format is chosen by the extension of the file, see readers.
+
+    :param graph: A Lifegraph
+    :param path: A .csv, .jsonl, .ndjson or .ics file
+    :param chunksize: (Default value = default_chunksize) The number of rows read into memory at a time
+    :returns: The number of rows that were added
+
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in readers:
+        raise ValueError(f"Can't load '{path}', the extension must be one of {', '.join(readers)}")
+    return add_chunks(graph, readers[extension](path, chunksize=chunksize))
@@ -1,42 +1,100 @@
+# matplotlib, numpy and dateutil are imported by the methods that need them, so that importing
+# lifegraph and describing a graph stays fast. They are loaded the first time a graph is drawn
+from contextlib import contextmanager
 from datetime import date
-from dateutil.relativedelta import relativedelta
 from enum import Enum
-from matplotlib import colors as mcolors
-from matplotlib.transforms import Bbox
 import datetime
 import gc
-import matplotlib.image as mpimg
-import matplotlib.lines as mlines
-import matplotlib.patches as patches
-import matplotlib.pyplot as plt
-import numpy as np
+import io
+import os
 import random
+import threading
+import time
 
+from . import placement, tex, textmetrics
 from .configuration import LifegraphParams, Papersize
+from .dates import add_years, date_positions, to_days
+from .stats import RenderStats, logger
 
 exclude = []
-colors = [(key, val)
-          for key, val in mcolors.BASE_COLORS.items() if val not in exclude]
-for key, val in mcolors.CSS4_COLORS.items():
-    if val not in exclude:
-        colors.append((key, val))
+_colors = None
+
+
+def _color_table():
+    """Internal, the (name, color) pairs random_color picks from, built the first time they are needed"""
+    global _colors
+    if _colors is None:
+        from matplotlib import colors as mcolors
+        table = [(key, val) for key, val in mcolors.BASE_COLORS.items() if val not in exclude]
+        for key, val in mcolors.CSS4_COLORS.items():
+            if val not in exclude:
+                table.append((key, val))
+        _colors = table
+    return _colors
+
+
+def __getattr__(name):
+    """Build the colors table when lifegraph.lifegraph.colors is first used"""
+    if name == "colors":
+        return _color_table()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# matplotlib.rcParams is shared by every thread, graphs drawn without pyplot hold this lock
+# while their settings are applied, which is the whole of a draw and save, so they run one at a time
+_rc_lock = threading.RLock()
 
 
 def random_color():
     """Returns a random color defined in matplotlib.colors.BASE_COLORS or matpotlib.colors.CSS4_COLORS"""
+    colors = _color_table()
     c = colors[random.randint(0, len(colors) - 1)]
     return c[1]
 
 
+def _is_png(name):
+    """Returns True if name is a path to a png file
+
+    :param name: The name and location a file should be saved at, or a file-like object
+
+    """
+    return isinstance(name, (str, os.PathLike)) and os.path.splitext(name)[1].lower() == ".png"
+
+
+def _unlink_shared(name):
+    """Remove the file at name if it has other hard links, so writing to name can't change them
+
+    A render cache may link its entries to the files it serves, which must not be written through.
+
+    :param name: The name and location a file should be saved at, or a file-like object
+
+    """
+    if isinstance(name, (str, os.PathLike)) and os.path.isfile(name) and os.stat(name).st_nlink > 1:
+        os.remove(name)
+
+
+# the order __draw adds each part of the graph in, see Lifegraph.__stack
+_layers = ("annotations", "eras", "era_spans", "watermark", "title", "image", "max_age")
+
+
 class Side(Enum):
     """Visually indicates the left or right of the plot"""
     LEFT = 1
     RIGHT = 2
 
 
+class GridMode(Enum):
+    """Selects how the squares of the grid are handed to matplotlib"""
+    LINES = 1  # one Line2D per year of life
+    MARKERS = 2  # every square as a marker of a single Line2D
+    PATH = 3  # the edges of every row and column of squares as dashed lines of a single path
+
+
 class Point:
     """A point class that holds the x and y coordinates in data units"""
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         """ Initialize the Point class
 
@@ -59,6 +117,8 @@ class Point:
 class DatePosition(Point):
     """A class to hold the week, year of life, and date assocaited with a Point"""
 
+    __slots__ = ("date",)
+
     def __init__(self, x, y, date):
         """Initialize the DatePosition class. The base class is a Point
 
@@ -82,6 +142,8 @@ class DatePosition(Point):
 class Marker(Point):
     """A class to indicate how and where to draw a marker"""
 
+    __slots__ = ("marker", "fillstyle", "color")
+
     def __init__(self, x, y, marker='s', fillstyle='none', color='black'):
         """A class to configure the marker on the graph. The base is a Point class
 
@@ -106,9 +168,76 @@ class Marker(Point):
         return f"Marker at {super().__repr__()}"
 
 
+class Extent:
+    """A rectangle in data units, the bounding box of an annotation label
+
+    It has the attributes of a matplotlib.transforms.Bbox that the layout uses, without the
+    transform machinery, so that it is cheap to keep one for every label.
+    """
+
+    __slots__ = ("x0", "y0", "x1", "y1")
+
+    def __init__(self, x0, y0, x1, y1):
+        """Initialize the Extent class
+
+        :param x0: The x coordinate of the first corner
+        :param y0: The y coordinate of the first corner
+        :param x1: The x coordinate of the opposite corner
+        :param y1: The y coordinate of the opposite corner
+
+        """
+        self.x0 = x0
+        self.y0 = y0
+        self.x1 = x1
+        self.y1 = y1
+
+    @property
+    def xmin(self):
+        """The left edge"""
+        return min(self.x0, self.x1)
+
+    @property
+    def xmax(self):
+        """The right edge"""
+        return max(self.x0, self.x1)
+
+    @property
+    def ymin(self):
+        """The smaller y coordinate"""
+        return min(self.y0, self.y1)
+
+    @property
+    def ymax(self):
+        """The larger y coordinate"""
+        return max(self.y0, self.y1)
+
+    @property
+    def width(self):
+        """x1 - x0, like Bbox.width"""
+        return self.x1 - self.x0
+
+    @property
+    def height(self):
+        """y1 - y0, like Bbox.height. It is negative on the graph, where the y axis is inverted"""
+        return self.y1 - self.y0
+
+    def __repr__(self):
+        """Print a description of the Extent class"""
+        return f"Extent ({self.x0}, {self.y0}) to ({self.x1}, {self.y1})"
+
+    def __str__(self):
+        """Print a description of the Extent class"""
+        return self.__repr__()
+
+
 class Annotation(Point):
     """A class to hold the text of an annotation with methods to help layout the text."""
 
+    __slots__ = ("label_point", "date", "text", "color", "bbox", "event_point", "put_circle_around_point", "marker",
+                 "relpos")
+    # set when the labels are laid out, see lifegraph.fingerprint.canonical
+    _layout_slots = ("x", "y", "bbox", "relpos")
+
     def __init__(self, date, text, label_point, color='black', bbox=None, event_point=None, put_circle_around_point=True, marker=None, relpos=(.5, .5)):
         """Initialize the Annotation class. THe base is a Point class.
 
@@ -125,6 +254,7 @@ class Annotation(Point):
 
         """
         super().__init__(label_point.x, label_point.y)
+        self.label_point = Point(label_point.x, label_point.y)
         self.date = date
         self.text = text
         self.color = color
@@ -137,11 +267,16 @@ class Annotation(Point):
     def set_bbox(self, bbox):
         """Set the bounding box of an annotation
 
-        :param bbox: a matplotlib.transforms.Bbox instance
+        :param bbox: An Extent, or anything else with the same attributes like a matplotlib.transforms.Bbox
 
         """
         self.bbox = bbox
 
+    def reset_position(self):
+        """Move the label text back to the point it was created at, undoing any layout"""
+        self.x = self.label_point.x
+        self.y = self.label_point.y
+
     def set_relpos(self, relpos):
         """Set the relative position that the arrow should draw from
 
@@ -262,6 +397,8 @@ class Annotation(Point):
 class Era():
     """A class which shows a highlighted area on the graph to indicate a span of time"""
 
+    __slots__ = ("text", "start", "end", "color", "alpha")
+
     def __init__(self, text, start, end, color, alpha=1):
         """Initialize the Era class
 
@@ -290,6 +427,8 @@ class Era():
 class EraSpan(Era):
     """A class which shows a dumbbell shape on the graph defining a span of your life"""
 
+    __slots__ = ("start_marker", "end_marker")
+
     def __init__(self, text, start, end, color, start_marker=None, end_marker=None):
         """Initalize the Era span class. The base is an Era.
 
@@ -307,9 +446,14 @@ class EraSpan(Era):
 
 
 class Lifegraph:
-    """This class will represent your life as a graph of boxes"""
+    """This class will represent your life as a graph of boxes
 
-    def __init__(self, birthdate, size=Papersize.A3, dpi=300, label_space_epsilon=0.2, max_age=90, axes_rect = [.25, .1, .5, .8]):
+    Graphs created with use_pyplot=False are thread-safe but not concurrent: any number of
+    threads can save them, but a lock lets only one graph in the process draw and save at a
+    time. Use lifegraph.batch.render_batch to render graphs in parallel, on several processes.
+    """
+
+    def __init__(self, birthdate, size=Papersize.A3, dpi=300, label_space_epsilon=0.2, max_age=90, axes_rect = [.25, .1, .5, .8], grid_mode=GridMode.PATH, use_pyplot=True, text_metrics=None, tex_fast_path=False, on_render=None, image_cache=None, placement_budget=None, record_spec=False):
         """Initalize the life graph
 
         :param birthdate: The date to start the graph from
@@ -318,6 +462,14 @@ class Lifegraph:
         :param label_space_epsilon: (Default value = .2) The minimum amount of space allowed between annotation text objects
         :param max_age: (Default value = 90) The ending age of the graph
         :param axes_rect: (Default value = [.25, .1, .5, .8]) The dimensions [left, bottom, width, height] of the axes instance passed to matplotlib.figure.Figure.add_axes
+        :param grid_mode: (Default value = GridMode.PATH) How the squares of the grid are drawn, see GridMode
+        :param use_pyplot: (Default value = True) If False, the graph is drawn on its own matplotlib.figure.Figure with an Agg canvas and never changes pyplot or the global rcParams outside of a save, so graphs can safely be saved from several threads, one at a time, see Lifegraph. show is not available in this mode
+        :param text_metrics: (Default value = None) A lifegraph.textmetrics.TextMetricsCache used to remember the size of annotation labels. lifegraph.textmetrics.default_cache is used if None
+        :param tex_fast_path: (Default value = False) If True and text.usetex is set, text that does not need LaTeX, like the default axis labels, is drawn with mathtext and the Computer Modern fonts instead of starting a LaTeX run
+        :param on_render: (Default value = None) A function called with the lifegraph.stats.RenderStats of every save and show
+        :param image_cache: (Default value = None) A lifegraph.cache.ImageCache that keeps the image of add_image decoded and shrunk to the size it is drawn at. lifegraph.cache.default_image_cache is used if None
+        :param placement_budget: (Default value = None) If provided, the labels placed by the greedy pass are moved by lifegraph.placement.resolve_annealing to untangle crossed leader lines and keep them on the page, for at most this many seconds per save. Both columns of labels share this budget. The greedy placement is kept if nothing better is found in time
+        :param record_spec: (Default value = False) If True, the arguments of every call to a public method are kept so that to_spec can describe the graph. They are a copy of every event, so it is off by default
 
         """
         if birthdate is None or not isinstance(birthdate, datetime.date):
@@ -325,11 +477,23 @@ class Lifegraph:
 
         self.birthdate = birthdate
 
+        self.size = size
         self.settings = LifegraphParams(size)
         self.settings.rcParams["figure.dpi"] = dpi
         self.axes_rect = axes_rect
+        self.grid_mode = grid_mode
+        self.use_pyplot = use_pyplot
+        self.text_metrics = text_metrics
+        self.tex_fast_path = tex_fast_path
+        self.on_render = on_render
+        self.image_cache = image_cache
+
+        # the timings and counters of the last save or show
+        self.stats = RenderStats()
 
+        self.fig = None
         self.renderer = None
+        self.__drawn = None
 
         # the data limits, we want a grid of 52 weeks by 90 years
         # negative minimum so that ths squares are not cut off
@@ -355,11 +519,15 @@ class Lifegraph:
         self.watermark_text = None
 
         self.label_space_epsilon = label_space_epsilon
+        self.placement_budget = placement_budget
 
         self.annotations = []
         self.eras = []
         self.era_spans = []
 
+        # every call to a public method that describes the graph, in order, if record_spec is set, see to_spec
+        self.__calls = [] if record_spec else None
+
     #region Public drawing methods
     def format_x_axis(self, text=None, positionx=None, positiony=None, color=None, fontsize=None):
         """Format the x axis. This method is required.
@@ -387,6 +555,8 @@ class Lifegraph:
         if fontsize is not None:
             self.settings.otherParams["xlabel.fontsize"] = fontsize
 
+        self.__record("x_axis", text=text, positionx=positionx, positiony=positiony, color=color, fontsize=fontsize)
+
     def format_y_axis(self, text=None, positionx=None, positiony=None, color=None, fontsize=None):
         """Format the y axis. This method is required.
 
@@ -413,9 +583,12 @@ class Lifegraph:
         if fontsize is not None:
             self.settings.otherParams["ylabel.fontsize"] = fontsize
 
+        self.__record("y_axis", text=text, positionx=positionx, positiony=positiony, color=color, fontsize=fontsize)
+
     def show_max_age_label(self):
         """Places the max age on the bottom right of the plot"""
         self.draw_max_age = True
+        self.__record("max_age_label")
 
     def add_life_event(self, text, date, color=None, hint=None, side=None, color_square=True):
         """Label an event in your life
@@ -428,7 +601,7 @@ class Lifegraph:
         :param color_square: (Default value = True) Colors the sqaure on the graph the same color as the text if True. The sqaure is the default color of the graph squares otherwise
 
         """
-        if (date < self.birthdate or date > (relativedelta(years=self.ymax) + self.birthdate)):
+        if (date < self.birthdate or date > add_years(self.birthdate, self.ymax)):
             raise ValueError(
                 f"The event date must be a valid datetime.date object that is at least as recent as the birthdate and no larger than {self.ymax}")
 
@@ -447,6 +620,74 @@ class Lifegraph:
         a = Annotation(date, text, label_point=label_point, color=color,
                        event_point=Point(position.x, position.y), marker=marker)
         self.annotations.append(a)
+        self.__record("life_event", text=text, date=date, color=color, hint=hint, side=side, color_square=color_square)
+
+    def add_life_events(self, texts, dates, colors=None, side=None, color_square=True):
+        """Label many events in your life at once
+
+        The squares of all of the dates are found in a single pass over the dates, see date_positions.
+
+        :param texts: A sequence with the text of each event
+        :param dates: An array-like of dates with the same length as texts, see date_positions
+        :param colors: (Default value = None) One color for every event, a sequence with a color for each event, or None for a random color per event
+        :param side: (Default value = None) A Side to put every label on, or a sequence with a Side or None for each event. Where it is None, the side is determined by the date
+        :param color_square: (Default value = True) Colors the sqaures on the graph the same color as the text if True
+
+        """
+        days = to_days(dates)
+        xs, ys = self.date_positions(days)
+        if len(texts) != len(xs):
+            raise ValueError("There must be one text for every date")
+
+        from matplotlib.colors import is_color_like
+
+        if colors is None or isinstance(colors, str) or is_color_like(colors):
+            colors = [colors] * len(xs)
+        colors = list(colors)
+        if len(colors) != len(xs):
+            raise ValueError("There must be one color for every event, or a single color for all of them")
+        if side is None or isinstance(side, Side):
+            side = [side] * len(xs)
+        sides = list(side)
+        if len(sides) != len(xs):
+            raise ValueError("There must be one side for every event, or a single side for all of them")
+        resolved = []
+
+        for text, date, x, y, color, side in zip(texts, days.tolist(), xs.tolist(), ys.tolist(), colors, sides):
+            if color is None:
+                color = random_color()
+            resolved.append(color)
+
+            default_x = self.xmax if (x >= self.xmax / 2) else 0
+            label_point = self.__get_label_point(None, side, default_x, y)
+
+            marker = None
+            if color_square:
+                marker = Marker(x, y, color=color)
+
+            self.annotations.append(Annotation(date, text, label_point=label_point, color=color,
+                                               event_point=Point(x, y), marker=marker))
+
+        self.__record("life_events", texts=list(texts), dates=days, colors=resolved, side=sides, color_square=color_square)
+
+    def date_positions(self, dates):
+        """Find the squares of many dates in one vectorized pass
+
+        The squares are the same ones the add_* methods use for a single date.
+
+        :param dates: An array-like of datetime.date, numpy.datetime64 or a pandas column of dates
+        :returns: A tuple of two integer arrays, the week (x) and year of life (y) of each date
+
+        """
+        import numpy as np
+
+        days = to_days(dates)
+        last = np.datetime64(add_years(self.birthdate, self.ymax), "D")
+        if days.size > 0 and (days.min() < np.datetime64(self.birthdate, "D") or days.max() > last):
+            raise ValueError(
+                f"The event date must be a valid datetime.date object that is at least as recent as the birthdate and no larger than {self.ymax}")
+
+        return date_positions(self.birthdate, days, weeks=self.xmax)
 
     def add_era(self, text, start_date, end_date, color=None, side=None, alpha=0.3):
         """Color in a section of your life
@@ -459,10 +700,10 @@ class Lifegraph:
         :param alpha: (Default value = 0.3) the alpha value of the color
 
         """
-        if (start_date < self.birthdate or start_date > (relativedelta(years=self.ymax) + self.birthdate)):
+        if (start_date < self.birthdate or start_date > add_years(self.birthdate, self.ymax)):
             raise ValueError(
                 f"The event date must be a valid datetime.date object that is at least as recent as the birthdate and no larger than {self.ymax}")
-        if (end_date < self.birthdate or end_date > (relativedelta(years=self.ymax) + self.birthdate)):
+        if (end_date < self.birthdate or end_date > add_years(self.birthdate, self.ymax)):
             raise ValueError(
                 f"The event date must be a valid datetime.date object that is at least as recent as the birthdate and no larger than {self.ymax}")
 
@@ -476,7 +717,7 @@ class Lifegraph:
             Era(text, start_position, end_position, color, alpha=alpha))
 
         label_point = self.__get_label_point(
-            hint=None, side=side, default_x=self.xmax, default_y=np.average((start_position.y, end_position.y)), is_Era=True)
+            hint=None, side=side, default_x=self.xmax, default_y=(start_position.y + end_position.y) / 2, is_Era=True)
         # when sorting the annotation the date is used
         # choose the middle date so that the annotation ends up
         # as close to the middle of the era as possible
@@ -486,6 +727,7 @@ class Lifegraph:
         a = Annotation(middle_date, text, label_point=label_point, color=color,
                        event_point=label_point, put_circle_around_point=False)
         self.annotations.append(a)
+        self.__record("era", text=text, start_date=start_date, end_date=end_date, color=color, side=side, alpha=alpha)
 
     def add_era_span(self, text, start_date, end_date, color=None, hint=None, side=None, color_start_and_end_markers=False):
         """Add a dumbbell around a section of your life
@@ -499,10 +741,10 @@ class Lifegraph:
         :param color_start_and_end_markers: Default value = False) Colors the sqaures indicating the start and end date on the graph the same color as the text if True. The sqaures are the default color of the graph squares otherwise
 
         """
-        if (start_date < self.birthdate or start_date > (relativedelta(years=self.ymax) + self.birthdate)):
+        if (start_date < self.birthdate or start_date > add_years(self.birthdate, self.ymax)):
             raise ValueError(
                 f"The event date must be a valid datetime.date object that is at least as recent as the birthdate and no larger than {self.ymax}")
-        if (end_date < self.birthdate or end_date > (relativedelta(years=self.ymax) + self.birthdate)):
+        if (end_date < self.birthdate or end_date > add_years(self.birthdate, self.ymax)):
             raise ValueError(
                 f"The event date must be a valid datetime.date object that is at least as recent as the birthdate and no larger than {self.ymax}")
 
@@ -512,7 +754,7 @@ class Lifegraph:
         start_position = self.__to_date_position(start_date)
         end_position = self.__to_date_position(end_date)
         label_point = self.__get_label_point(
-            hint, side, self.xmax, np.average((start_position.y, end_position.y)))
+            hint, side, self.xmax, (start_position.y + end_position.y) / 2)
 
         start_marker = None
         end_marker = None
@@ -527,11 +769,12 @@ class Lifegraph:
 
         middle_date = start_date + (end_date - start_date)/2
 
-        event_point = Point(np.average((start_position.x, end_position.x)), np.average(
-            (start_position.y, end_position.y)))
+        event_point = Point((start_position.x + end_position.x) / 2, (start_position.y + end_position.y) / 2)
 
         self.annotations.append(Annotation(middle_date, text, label_point=label_point,
                                            color=color, event_point=event_point, put_circle_around_point=False))
+        self.__record("era_span", text=text, start_date=start_date, end_date=end_date, color=color, hint=hint, side=side,
+                      color_start_and_end_markers=color_start_and_end_markers)
 
     def add_watermark(self, text):
         """Adds a watermark to the graph. 
@@ -542,6 +785,7 @@ class Lifegraph:
 
         """
         self.watermark_text = text
+        self.__record("watermark", text=text)
 
     def add_title(self, text, fontsize=None):
         """Adds a title to the graph.
@@ -555,6 +799,7 @@ class Lifegraph:
         self.title = text
         if fontsize is not None:
             self.title_fontsize = fontsize
+        self.__record("title", text=text, fontsize=fontsize)
 
     def add_image(self, image_name, alpha=1):
         """Adds an image that is cliped to the axes size of the graph.
@@ -567,53 +812,381 @@ class Lifegraph:
         """
         self.image_name = image_name
         self.image_alpha = alpha
+        self.__record("image", image_name=image_name, alpha=alpha)
+
+    def to_spec(self):
+        """Describe the graph as a spec that Lifegraph.from_spec creates it again from
+
+        The spec holds the arguments the graph was created with, the settings changed on it and
+        every call to its public methods, in order. Colors that were picked at random are stored,
+        so the graph looks the same when it is created again. See lifegraph.spec.build for the
+        format and lifegraph.spec.dumps to encode it. The graph must be created with
+        record_spec=True.
+
+        :returns: A dict that can be written as JSON
+
+        """
+        from . import spec
+
+        if self.__calls is None:
+            raise ValueError("to_spec needs a graph created with record_spec=True")
+
+        return spec.describe(self, self.__calls)
+
+    @classmethod
+    def from_spec(cls, spec, **kwargs):
+        """Create a graph from a spec
+
+        :param spec: A dict returned by to_spec, or a spec encoded by lifegraph.spec.dumps
+        :param kwargs: Other arguments to Lifegraph that are not part of the spec, e.g. use_pyplot=False
+
+        """
+        from . import spec as specs
+
+        if isinstance(spec, (str, bytes, bytearray, memoryview)):
+            spec = specs.loads(spec)
+        return specs.build(spec, **kwargs)
 
     def show(self):
         """Show the grpah"""
-        self.__draw()
+        if not self.use_pyplot:
+            raise ValueError("Showing the graph requires use_pyplot=True")
+        import matplotlib.pyplot as plt
+
+        self.stats = RenderStats()
+        with self.__rc_context():
+            with self.stats.phase("draw"):
+                self.__draw()
+        self.__report()
         plt.show()
 
     def close(self):
         """Close the graph"""
-        self.fig.clf()
-        plt.close()
+        if self.fig is not None:
+            self.fig.clf()
+            if self.use_pyplot:
+                import matplotlib.pyplot as plt
+                plt.close(self.fig)
+        self.fig = None
+        self.renderer = None
+        self.__drawn = None
 
-    def save(self, name, transparent=False):
+    def save(self, name, transparent=False, band_height=None, render_cache=None):
         """Save the graph.
 
+        The figure is kept between calls. Saving again only redraws the parts of the graph that
+        changed since the last save.
+
         :param name: The name and location the file should be saved at
         :param transparent: Default value = False)
+        :param band_height: (Default value = None) If provided, the graph is rendered this many rows of pixels at a time and each band is written to the file before the next one is rendered, so memory is bounded by the size of a band instead of the whole image. The file must be a .png, .tif or .tiff
+        :param render_cache: (Default value = None) A lifegraph.cache.RenderCache. If provided, a file saved before from a graph with the same fingerprint is linked or copied to name instead of drawing the graph, and a newly drawn file is added to the cache
+
+        """
+        if render_cache is not None and not isinstance(name, (str, os.PathLike)):
+            raise ValueError("The render cache can only be used when saving to the path of a file")
+        if band_height is not None:
+            from . import tiled
+            if not isinstance(name, (str, os.PathLike)) or os.path.splitext(name)[1].lower() not in tiled.writers:
+                raise ValueError(f"Can't save '{name}' in bands, it must be the path of a {', '.join(tiled.writers)} file")
+            if band_height < 1:
+                raise ValueError("band_height must be at least one row")
+
+        self.stats = RenderStats()
+        if render_cache is not None:
+            with self.stats.phase("render_cache"):
+                key = render_cache.key(self.fingerprint(), os.path.splitext(name)[1].lower(), transparent, band_height)
+                found = render_cache.fetch(key, name)
+            self.stats.render_cache = "hit" if found else "miss"
+            if found:
+                self.__report()
+                return
+
+        _unlink_shared(name)
+
+        with self.__rc_context():
+            with self.stats.phase("draw"):
+                self.__update()
+            if band_height is not None:
+                self.__save_bands(name, transparent, band_height)
+            else:
+                with self.stats.phase("savefig"):
+                    self.fig.savefig(name, transparent=transparent)
+
+        if render_cache is not None:
+            with self.stats.phase("render_cache"):
+                render_cache.store(key, name)
+        self.__report()
+
+    def fingerprint(self):
+        """A hash of everything that changes how the graph looks
+
+        It covers the birthdate, papersize, settings, axis labels, every event, era and era span,
+        the title, watermark, the contents of the image, the max age label and the source of the
+        lifegraph package and matplotlib version it is rendered with. Two graphs with the same
+        fingerprint are saved as the same file.
+        """
+        from importlib import metadata
+
+        from . import fingerprint
+
+        try:
+            mpl_version = metadata.version("matplotlib")
+        except metadata.PackageNotFoundError:
+            import matplotlib
+            mpl_version = matplotlib.__version__
+
+        return fingerprint.digest({
+            "lifegraph": fingerprint.source_digest(),
+            "matplotlib": mpl_version,
+            "birthdate": self.birthdate,
+            "size": self.size,
+            "layout": self.__layout_state(),
+            "annotations": self.annotations,
+            "eras": self.eras,
+            "era_spans": self.era_spans,
+            "decorations": [(name, state) for name, state, _ in self.__decorations()],
+            "title_fontsize": getattr(self, "title_fontsize", None),
+            "image": fingerprint.file_digest(self.image_name) if self.image_name is not None else None,
+        })
+
+    def save_many(self, names, transparent=False, max_workers=None):
+        """Save the graph to several files, laying it out and drawing it only once.
+
+        The format of each file is taken from its extension. The figure is rendered to pixels once
+        for every png file, and the png files are encoded in threads while the other formats, like
+        pdf and svg, are written by matplotlib one after the other.
+
+        :param names: A list of names and locations the graph should be saved at
+        :param transparent: Default value = False)
+        :param max_workers: (Default value = None) The number of threads encoding png files, see concurrent.futures.ThreadPoolExecutor
 
         """
-        self.__draw()
-        plt.savefig(name, transparent=transparent)
+        from concurrent.futures import ThreadPoolExecutor
+        import matplotlib.image as mpimg
+
+        names = list(names)
+        rasters = [name for name in names if _is_png(name)]
+        vectors = [name for name in names if not _is_png(name)]
+        for name in names:
+            _unlink_shared(name)
+        self.stats = RenderStats()
+        with self.__rc_context():
+            with self.stats.phase("draw"):
+                self.__update()
+            if rasters:
+                with self.stats.phase("render"):
+                    rgba = self.__render_rgba(transparent)
+
+            with ThreadPoolExecutor(max_workers) as pool:
+                futures = [pool.submit(mpimg.imsave, name, rgba, dpi=self.fig.dpi, format="png") for name in rasters]
+                # savefig changes the state of the figure while it renders, so only one can run at a time
+                with self.stats.phase("savefig"):
+                    for name in vectors:
+                        self.fig.savefig(name, transparent=transparent)
+                # the time spent waiting for the png files after the other formats are written
+                with self.stats.phase("encode"):
+                    for future in futures:
+                        future.result()
+        self.__report()
     #endregion Public drawing methods
 
     #region Private drawing methods
-    def __draw(self):
-        """Internal, trigger drawing of the graph"""
-        plt.rcParams.update(self.settings.rcParams)
+    def __record(self, kind, **arguments):
+        """Internal, remember a call to a public method for to_spec
 
-        self.fig = plt.figure()
-        self.ax = self.fig.add_axes(self.axes_rect)
+        :param kind: The kind of item the call is written as, see lifegraph.spec.items
+        :param arguments: The arguments of the call, after random colors were picked
 
-        xs = np.arange(1, self.xmax+1)
-        ys = [np.arange(0, self.ymax) for i in range(self.xmax)]
+        """
+        if self.__calls is not None:
+            self.__calls.append((kind, arguments))
 
-        self.ax.plot(xs, ys)
+    @contextmanager
+    def __rc_context(self):
+        """Internal, apply the rcParams of the graph while it is drawn and saved
 
-        self.__draw_xaxis()
-        self.__draw_yaxis()
+        With pyplot, the settings are applied to the global rcParams like any other pyplot figure.
+        Without it, they only apply inside of this context, and the lock keeps other threads
+        from drawing with them.
+        """
+        import matplotlib
+
+        rc = self.settings.rcParams
+        if self.tex_fast_path and rc["text.usetex"]:
+            # LaTeX sets math in Computer Modern, so mathtext should too
+            rc = {**rc, "mathtext.fontset": "cm"}
+
+        if self.use_pyplot:
+            import matplotlib.pyplot as plt
+            plt.rcParams.update(rc)
+            yield
+        else:
+            with _rc_lock, matplotlib.rc_context(rc):
+                yield
+
+    def __report(self):
+        """Internal, hand the stats of a render to the logger and the on_render callback"""
+        logger.debug("%s", self.stats)
+        if self.on_render is not None:
+            self.on_render(self.stats)
 
-        self.__draw_annotations()
-        self.__draw_eras()
-        self.__draw_era_spans()
-        self.__draw_watermark()
-        self.__draw_title()
-        self.__draw_image()
-        self.__draw_max_age()
+    def __draw(self):
+        """Internal, trigger drawing of the graph"""
+        stats = self.stats
+        stats.full_draw = True
+        with stats.phase("draw.figure"):
+            if self.use_pyplot:
+                import matplotlib.pyplot as plt
+                self.fig = plt.figure()
+            else:
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                from matplotlib.figure import Figure
+                self.fig = Figure()
+                FigureCanvasAgg(self.fig)
+            self.renderer = None
+            self.ax = self.fig.add_axes(self.axes_rect)
+
+        with stats.phase("draw.grid"):
+            self.__draw_grid()
+        with stats.phase("draw.xaxis"):
+            self.__draw_xaxis()
+        with stats.phase("draw.yaxis"):
+            self.__draw_yaxis()
+
+        drawn = {}
+        with stats.phase("draw.annotations"):
+            drawn["annotations"] = (list(self.annotations), self.__draw_annotations())
+        with stats.phase("draw.eras"):
+            self.__draw_eras(self.eras)
+        drawn["eras"] = list(self.eras)
+        with stats.phase("draw.era_spans"):
+            self.__draw_era_spans(self.era_spans)
+        drawn["era_spans"] = list(self.era_spans)
+        for name, state, draw in self.__decorations():
+            with stats.phase(f"draw.{name}"):
+                drawn[name] = (state, draw())
+
+        with stats.phase("draw.aspect"):
+            self.ax.set_aspect('equal', share=True)
+
+        drawn["layout"] = self.__layout_state()
+        self.__drawn = drawn
+
+    def __update(self):
+        """Internal, bring the figure up to date with the graph, redrawing as little as possible
+
+        Eras and era spans added since the last draw are added to the figure. If the annotations
+        changed, all of them are laid out and drawn again, because one new label can move the
+        labels around it. The watermark, title, image and max age are redrawn if they changed.
+        Any other change, like new settings or axis labels, draws the whole graph again.
+        """
+        drawn = self.__drawn
+        if (self.fig is None or drawn is None or drawn["layout"] != self.__layout_state()
+                or self.eras[:len(drawn["eras"])] != drawn["eras"]
+                or self.era_spans[:len(drawn["era_spans"])] != drawn["era_spans"]):
+            self.__draw()
+            return
+
+        stats = self.stats
+        stats.full_draw = False
+        annotations, artists = drawn["annotations"]
+        if self.annotations != annotations:
+            with stats.phase("draw.annotations"):
+                for artist in artists:
+                    artist.remove()
+                # lay the labels out on the axes position __draw measured them on, before the aspect was applied
+                self.ax.set_position(self.ax.get_position(original=True), which='active')
+                drawn["annotations"] = (list(self.annotations), self.__draw_annotations())
+
+        with stats.phase("draw.eras"):
+            self.__draw_eras(self.eras[len(drawn["eras"]):])
+        drawn["eras"] = list(self.eras)
+        with stats.phase("draw.era_spans"):
+            self.__draw_era_spans(self.era_spans[len(drawn["era_spans"]):])
+        drawn["era_spans"] = list(self.era_spans)
+
+        for name, state, draw in self.__decorations():
+            old_state, artists = drawn[name]
+            if state != old_state:
+                with stats.phase(f"draw.{name}"):
+                    for artist in artists:
+                        if name == "title":
+                            # the figure reuses the Text of its suptitle, so it can't be removed
+                            artist.set_visible(False)
+                        else:
+                            artist.remove()
+                    drawn[name] = (state, draw())
+
+    def __layout_state(self):
+        """Internal, the state that the whole graph has to be drawn again for when it changes"""
+        return (dict(self.settings.rcParams), dict(self.settings.otherParams), self.xaxis_label, self.yaxis_label,
+                list(self.axes_rect), list(self.xlims), list(self.ylims), self.grid_mode, self.tex_fast_path,
+                self.label_space_epsilon, self.placement_budget)
+
+    def __decorations(self):
+        """Internal, the name, current state and draw method of each decoration, in the order they are drawn"""
+        return [
+            ("watermark", self.watermark_text, self.__draw_watermark),
+            ("title", self.title, self.__draw_title),
+            ("image", (self.image_name, self.image_alpha), self.__draw_image),
+            ("max_age", self.draw_max_age, self.__draw_max_age),
+        ]
+
+    def __stack(self, artists, layer):
+        """Internal, keep artists of the same zorder stacked in the order __draw adds them
+
+        matplotlib draws artists of the same zorder in the order they were added, so anything
+        added by __update would end up above everything __draw added. A small offset per layer
+        keeps the order the same no matter when an artist was added. The default zorders are whole
+        numbers, so stacking an artist again does not move it.
+
+        :param artists: A list of matplotlib artists
+        :param layer: The name of the layer the artists belong to
 
-        self.ax.set_aspect('equal', share=True)
+        """
+        offset = _layers.index(layer) * 1e-3
+        for artist in artists:
+            artist.set_zorder(int(artist.get_zorder()) + offset)
+        self.stats.count_artists(layer, len(artists))
+        return artists
+
+    def __draw_grid(self):
+        """Internal, draw the squares of the grid
+
+        With GridMode.MARKERS every square is a marker on one Line2D, so the backend
+        builds the square once and stamps it at each position. The squares are
+        laid out row by row, the same order GridMode.LINES draws them in. GridMode.PATH
+        draws the same markers, but writes square outlines to pdf and svg files as one dashed
+        path, see lifegraph.grid.SquareGrid.
+        """
+        import numpy as np
+
+        if self.grid_mode == GridMode.LINES:
+            xs = np.arange(1, self.xmax+1)
+            ys = [np.arange(0, self.ymax) for i in range(self.xmax)]
+            self.grid_artists = self.ax.plot(xs, ys)
+        elif self.grid_mode == GridMode.MARKERS:
+            xs, ys = np.meshgrid(np.arange(1, self.xmax+1), np.arange(0, self.ymax))
+            self.grid_artists = self.ax.plot(xs.ravel(), ys.ravel())
+        elif self.grid_mode == GridMode.PATH:
+            from .grid import SquareGrid
+
+            columns, rows = np.arange(1, self.xmax+1), np.arange(0, self.ymax)
+            xs, ys = np.meshgrid(columns, rows)
+            # the line GridMode.MARKERS would draw, it resolves the color and marker settings
+            markers, = self.ax.plot(xs.ravel(), ys.ravel())
+            if SquareGrid.supports(markers):
+                grid = SquareGrid(columns, rows)
+                grid.update_from(markers)
+                markers.remove()
+                self.ax.add_line(grid)
+                markers = grid
+            # any other marker is drawn as markers in every format
+            self.grid_artists = [markers]
+        else:
+            raise ValueError("Unknown grid mode")
+        self.stats.count_artists("grid", len(self.grid_artists))
 
     def __draw_xaxis(self):
         """Internal, draw the components of the x-axis"""
@@ -627,7 +1200,8 @@ class Lifegraph:
             "xlabel.color"] is None else self.settings.otherParams["xlabel.color"]
         self.ax.set_xticks(xticks)
         self.ax.set_xticklabels(xticks[:-1])
-        self.ax.set_xlabel(self.xaxis_label, fontsize=fs, color=color)
+        self.__set_tick_label_props(self.ax.xaxis)
+        self.ax.set_xlabel(self.xaxis_label, fontsize=fs, color=color, **self.__text_props(self.xaxis_label))
         self.ax.xaxis.set_label_coords(
             *self.settings.otherParams["xlabel.position"])
 
@@ -641,7 +1215,8 @@ class Lifegraph:
         color = self.settings.rcParams["axes.labelcolor"] if self.settings.otherParams[
             "ylabel.color"] is None else self.settings.otherParams["ylabel.color"]
         self.ax.set_yticks(yticks)
-        self.ax.set_ylabel(self.yaxis_label, fontsize=fs, color=color)
+        self.__set_tick_label_props(self.ax.yaxis)
+        self.ax.set_ylabel(self.yaxis_label, fontsize=fs, color=color, **self.__text_props(self.yaxis_label))
         self.ax.yaxis.set_label_coords(
             *self.settings.otherParams["ylabel.position"])
         self.ax.invert_yaxis()
@@ -651,66 +1226,87 @@ class Lifegraph:
         
         The arrowprops keyword arguments to the annotation, shrinkB, is calculated so that
         regardless of plot size, the edge of the annotaiton line ends at the edge of the circle
+
+        :returns: The artists that were added
         """
         final = self.__resolve_annotation_conflicts(self.annotations)
 
         shrinkB = self.settings.rcParams["lines.markersize"]+self.settings.rcParams["lines.markeredgewidth"]
+        artists = []
         for a in final:
             if a.put_circle_around_point:
-                self.ax.plot(a.event_point.x, a.event_point.y, marker='o', markeredgecolor=a.color,
-                             ms=self.settings.rcParams["lines.markersize"]*2.0)
+                artists += self.ax.plot(a.event_point.x, a.event_point.y, marker='o', markeredgecolor=a.color,
+                                        ms=self.settings.rcParams["lines.markersize"]*2.0)
 
             if a.marker is not None:
-                self.ax.plot(
+                artists += self.ax.plot(
                     a.marker.x, a.marker.y, markeredgecolor=a.marker.color, marker=a.marker.marker)
 
-            self.ax.annotate(a.text, xy=(a.event_point.x, a.event_point.y), xytext=(a.x, a.y),
-                             weight='bold', color=a.color, va='center', ha='left',
-                             arrowprops=dict(arrowstyle='-',
-                                             connectionstyle='arc3',
-                                             color=a.color,
-                                             shrinkA=self.settings.otherParams["annotation.shrinkA"],
-                                             shrinkB=shrinkB,
-                                             # search for 'relpos' on https://matplotlib.org/tutorials/text/annotations.html
-                                             relpos=a.relpos,
-                                             linewidth=self.settings.otherParams["annotation.line.width"]))
-
-    def __draw_eras(self):
-        """Internal, draw all of the eras on the graph"""
-        xmin = self.ax.transLimits.transform((1-.5, 0))[0]
-        xmax = self.ax.transLimits.transform((self.xmax+.5, 0))[0]
-        for era in self.eras:
-            for y in range(era.start.y, era.end.y+1):
-                if y == era.start.y:
-                    axesUnits = self.ax.transLimits.transform(
-                        (era.start.x-.5, era.start.y))
-                    self.ax.axhspan(y-.5, y+.5, facecolor=era.color,
-                                    alpha=era.alpha, xmin=axesUnits[0], xmax=xmax)
-                elif y == era.end.y:
-                    axesUnits = self.ax.transLimits.transform(
-                        (era.end.x+.5, era.end.y))
-                    self.ax.axhspan(y-.5, y+.5, facecolor=era.color,
-                                    alpha=era.alpha, xmin=xmin, xmax=axesUnits[0])
-                else:
-                    self.ax.axhspan(y-.5, y+.5, facecolor=era.color,
-                                    alpha=era.alpha, xmin=xmin, xmax=xmax)
-
-    def __draw_era_spans(self):
-        """Internal, draw all of the dumbbell era spans on the graph
+            artists.append(self.ax.annotate(
+                a.text, xy=(a.event_point.x, a.event_point.y), xytext=(a.x, a.y),
+                color=a.color, va='center', ha='left', **{'weight': 'bold', **self.__text_props(a.text)},
+                arrowprops=dict(arrowstyle='-',
+                                connectionstyle='arc3',
+                                color=a.color,
+                                shrinkA=self.settings.otherParams["annotation.shrinkA"],
+                                shrinkB=shrinkB,
+                                # search for 'relpos' on https://matplotlib.org/tutorials/text/annotations.html
+                                relpos=a.relpos,
+                                linewidth=self.settings.otherParams["annotation.line.width"])))
+        return self.__stack(artists, "annotations")
+
+    def __draw_eras(self, eras):
+        """Internal, draw eras on the graph
+
+        Each era is a single polygon that steps along the rows it covers. It starts at the
+        square of the start date and runs to the end of that row, covers every full row in
+        between, and stops at the square of the end date. The right side runs past the end of
+        the axes, the polygon is clipped to them.
+
+        :param eras: The Era instances to draw
+
+        """
+        import matplotlib.patches as patches
+
+        left = 1 - .5
+        right = self.xmax + .5
+        for era in eras:
+            top = era.start.y - .5
+            bottom = era.end.y + .5
+            start = era.start.x - .5
+            if era.start.y == era.end.y:
+                verts = [(start, top), (right, top), (right, bottom), (start, bottom)]
+            else:
+                end = era.end.x + .5
+                verts = [(start, top), (right, top), (right, bottom - 1), (end, bottom - 1),
+                         (end, bottom), (left, bottom), (left, top + 1), (start, top + 1)]
+            polygon = patches.Polygon(verts, closed=True, facecolor=era.color, alpha=era.alpha)
+            self.ax.add_patch(polygon)
+            self.__stack([polygon], "eras")
+
+    def __draw_era_spans(self, era_spans):
+        """Internal, draw dumbbell era spans on the graph
 
         This is done by placing a circle around the start and end point. Then a line is drawn
         starting at the edge of each circle. The edge is found using a quadrant sensitive inverse
         tangent function and parametric equations of a circle.
-        
+
+        :param era_spans: The EraSpan instances to draw
+
         """
-        for era in self.era_spans:
+        import matplotlib.lines as mlines
+        import matplotlib.patches as patches
+        import numpy as np
+
+        for era in era_spans:
             radius = .5
-            circle1 = plt.Circle((era.start.x, era.start.y), radius,
+            circle1 = patches.Circle((era.start.x, era.start.y), radius,
                                  color=era.color, fill=False, lw=self.settings.otherParams["annotation.edge.width"])
-            circle2 = plt.Circle((era.end.x, era.end.y), radius,
+            circle2 = patches.Circle((era.end.x, era.end.y), radius,
                                  color=era.color, fill=False, lw=self.settings.otherParams["annotation.edge.width"])
             self.ax.add_artist(circle1)
             self.ax.add_artist(circle2)
+            artists = [circle1, circle2]
 
             # to draw the line between the two circles, we need to find the point on the
             # each circle that is closest to the other circle
@@ -733,43 +1329,121 @@ class Lifegraph:
             y2 = era.end.y + np.sin(angle2) * radius
 
             if era.start_marker is not None:
-                self.ax.plot(era.start_marker.x, era.start_marker.y, color=era.start_marker.color, marker=era.start_marker.marker,
-                             fillstyle=era.start_marker.fillstyle)
+                artists += self.ax.plot(era.start_marker.x, era.start_marker.y, color=era.start_marker.color, marker=era.start_marker.marker,
+                                        fillstyle=era.start_marker.fillstyle)
 
             if era.end_marker is not None:
-                self.ax.plot(era.end_marker.x, era.end_marker.y, color=era.end_marker.color, marker=era.end_marker.marker,
-                             fillstyle=era.end_marker.fillstyle)
+                artists += self.ax.plot(era.end_marker.x, era.end_marker.y, color=era.end_marker.color, marker=era.end_marker.marker,
+                                        fillstyle=era.end_marker.fillstyle)
 
             l = mlines.Line2D([x1, x2], [y1, y2], color=era.color, linestyle=self.settings.otherParams["era.span.linestyle"],
                               markersize=self.settings.otherParams["era.span.markersize"], linewidth=self.settings.otherParams["annotation.line.width"])
             self.ax.add_line(l)
+            artists.append(l)
+            self.__stack(artists, "era_spans")
 
     def __draw_watermark(self):
         """Internal, draw the watermakr"""
-        if self.watermark_text is not None:
-            self.fig.text(0.5, 0.5, self.watermark_text,
+        if self.watermark_text is None:
+            return []
+        return self.__stack([self.fig.text(0.5, 0.5, self.watermark_text,
                           fontsize=self.settings.otherParams["watermark.fontsize"], color='gray',
-                          ha='center', va='center', alpha=0.3, rotation=65, transform=self.ax.transAxes)
+                          ha='center', va='center', alpha=0.3, rotation=65, transform=self.ax.transAxes,
+                          **self.__text_props(self.watermark_text))], "watermark")
 
     def __draw_title(self):
         """Internal, draw the title"""
-        if self.title is not None:
-            self.fig.suptitle(
-                self.title, y=self.settings.otherParams["figure.title.yposition"])
+        if self.title is None:
+            return []
+        title = self.fig.suptitle(
+            self.title, y=self.settings.otherParams["figure.title.yposition"], **self.__text_props(self.title))
+        title.set_visible(True)
+        return self.__stack([title], "title")
 
     def __draw_image(self):
         """Internal, draw the image"""
-        if self.image_name is not None:
-            img = mpimg.imread(self.image_name)
-            extent = (0.5, self.xmax+0.5, -0.5, self.ymax-0.5)
-            self.ax.imshow(img, extent=extent, origin='lower',
-                           alpha=self.image_alpha)
+        if self.image_name is None:
+            return []
+        from .cache import default_image_cache
+
+        extent = (0.5, self.xmax+0.5, -0.5, self.ymax-0.5)
+        # the squares have an equal aspect, so the axes shrink to the scale of the longer side of the data limits
+        scale = min(self.ax.bbox.width / abs(self.xlims[1] - self.xlims[0]),
+                    self.ax.bbox.height / abs(self.ylims[1] - self.ylims[0]))
+        size = (abs(extent[1] - extent[0]) * scale, abs(extent[3] - extent[2]) * scale)
+        cache = self.image_cache if self.image_cache is not None else default_image_cache
+        img = cache.get(self.image_name, size)
+        return self.__stack([self.ax.imshow(img, extent=extent, origin='lower',
+                                            alpha=self.image_alpha)], "image")
 
     def __draw_max_age(self):
-        if self.draw_max_age:
-            self.ax.text(self.xmax+3, self.ymax, str(self.ymax),
-                         fontsize=self.settings.otherParams["maxage.fontsize"],
-                         ha='center', va='bottom', transform=self.ax.transData)
+        """Internal, draw the max age"""
+        if not self.draw_max_age:
+            return []
+        return self.__stack([self.ax.text(self.xmax+3, self.ymax, str(self.ymax),
+                                          fontsize=self.settings.otherParams["maxage.fontsize"],
+                                          ha='center', va='bottom', transform=self.ax.transData,
+                                          **self.__text_props(str(self.ymax)))], "max_age")
+
+    def __render_rgba(self, transparent):
+        """Internal, render the figure to an RGBA buffer
+
+        :param transparent: Passed to matplotlib.figure.Figure.savefig
+
+        """
+        import numpy as np
+
+        buf = io.BytesIO()
+        self.fig.savefig(buf, format='rgba', transparent=transparent)
+        width, height = (int(v) for v in self.fig.bbox.size)
+        return np.frombuffer(buf.getbuffer(), dtype=np.uint8).reshape(height, width, 4)
+
+    def __save_bands(self, name, transparent, band_height):
+        """Internal, render the graph in horizontal bands and stream them into a png or tiff file
+
+        Each band is rendered by savefig with bbox_inches set to the rows it covers, so the canvas
+        matplotlib allocates is the size of the band. Images are resampled to the whole area they
+        are clipped to, so they are clipped to the band as well. Every artist is drawn once per
+        band, which trades some time for a bounded amount of memory.
+
+        :param name: The .png, .tif or .tiff file to write
+        :param transparent: Passed to matplotlib.figure.Figure.savefig
+        :param band_height: The number of rows of pixels in a band
+
+        """
+        import numpy as np
+        from matplotlib.transforms import Bbox, TransformedBbox
+
+        from . import tiled
+
+        dpi = self.fig.dpi
+        width, height = (int(v) for v in self.fig.bbox.size)
+        images = {im: (im.get_visible(), im.get_clip_box()) for im in self.ax.images}
+        try:
+            with open(name, "wb") as f:
+                writer = tiled.writers[os.path.splitext(name)[1].lower()](f, width, height, dpi)
+                for top in range(0, height, band_height):
+                    bottom = min(top + band_height, height)
+                    with self.stats.phase("render"):
+                        # in figure coordinates, which savefig maps onto the band while it renders
+                        clip = Bbox.intersection(self.ax.get_position(), Bbox([[0, 1 - bottom / height], [1, 1 - top / height]]))
+                        for im, (visible, _) in images.items():
+                            im.set_visible(visible and clip is not None)
+                            if clip is not None:
+                                im.set_clip_box(TransformedBbox(clip, self.fig.transFigure))
+                        buf = io.BytesIO()
+                        # bbox_inches is measured in inches from the bottom of the figure
+                        self.fig.savefig(buf, format='rgba', transparent=transparent,
+                                         bbox_inches=Bbox([[0, (height - bottom) / dpi], [width / dpi, (height - top) / dpi]]))
+                        band = np.frombuffer(buf.getbuffer(), dtype=np.uint8).reshape(bottom - top, width, 4)
+                    with self.stats.phase("encode"):
+                        writer.write(band)
+                    del band, buf
+                writer.close()
+        finally:
+            for im, (visible, clip_box) in images.items():
+                im.set_visible(visible)
+                im.set_clip_box(clip_box)
 
     def __resolve_annotation_conflicts(self, annotations):
         """Internal, Put annotation text labels on the graph while avoiding conflicts.
@@ -790,8 +1464,11 @@ class Lifegraph:
         left = []
         right = []
         for a in annotations:
-            # first, get the bounds
-            self.__set_annotation_bbox(a)
+            # start from where the label was put, in case it was laid out by an earlier draw
+            a.reset_position()
+            # first, get the bounds, one label at a time, the text is laid out on the axes with a shared renderer
+            with self.stats.phase("draw.annotations.measure"):
+                self.__set_annotation_bbox(a)
 
             # now set the intitial positions
             # we want all of the text to be on the left or right of the squares
@@ -827,22 +1504,22 @@ class Lifegraph:
         left.sort(key=lambda a: (a.event_point.y, a.event_point.x))
         right.sort(key=lambda a: (a.event_point.y, -a.event_point.x))
 
-        final = []
-        for lst in [left, right]:
-            _f = []
-            for unchecked in lst:
-                for checked in _f:
-                    if unchecked.overlaps(checked):
-                        correction = unchecked.get_xy_correction(
-                            checked, self.label_space_epsilon)
-                        unchecked.update_Y_with_correction(correction)
-                    if unchecked.is_within_epsilon_of(checked, self.label_space_epsilon):
-                        correction = [0, self.label_space_epsilon]
-                        unchecked.update_Y_with_correction(correction)
-                _f.append(unchecked)
-            final.extend(_f)
-
-        return final
+        if self.placement_budget is None:
+            final = []
+            with self.stats.phase("draw.annotations.resolve"):
+                for lst in [left, right]:
+                    final.extend(placement.resolve_conflicts(lst, self.label_space_epsilon))
+            return final
+
+        # labels should not leave the page, its top and bottom edges in data units
+        (_, y0), (_, y1) = self.ax.transData.inverted().transform(self.fig.transFigure.transform([(0, 0), (1, 1)]))
+        limits = (min(y0, y1), max(y0, y1))
+        with self.stats.phase("draw.annotations.optimize"):
+            # the columns share one deadline, they are optimized on threads of their own
+            left, right = placement.resolve_columns([left, right], self.label_space_epsilon, placement.resolve_annealing,
+                                                    max_workers=2, deadline=time.perf_counter() + self.placement_budget,
+                                                    limits=limits)
+        return left + right
 
     def __to_date_position(self, date):
         """Internal, compose a DatePosition from a date
@@ -857,7 +1534,7 @@ class Lifegraph:
         # something that happens within or up to (not including) 7 days after the start
         # of the year happens in the first week of your life that year
         # Using this logic, your birthday will always happen on week 1 of each year
-        start_of_year = self.birthdate + relativedelta(years=year)
+        start_of_year = add_years(self.birthdate, year)
         diff = date - start_of_year
         week = diff.days // 7
 
@@ -887,22 +1564,76 @@ class Lifegraph:
     def __set_annotation_bbox(self, a):
         """Internal, determine the bounding box of some text to aid in layout
 
+        The extent of the text is looked up in the text metrics cache first. The text is only
+        measured if it has not been seen with the same font, size and dpi before.
+
         :param a: A string of text
 
         """
-        # put the text on the plot temporarily so that we can determine the width of the text
-        t = self.ax.text(a.x, a.y, a.text, transform=self.ax.transData,
-                         ha='center', va='center')
+        import matplotlib
+        from matplotlib.font_manager import FontProperties, findfont
 
-        if (self.renderer is None):
-            self.renderer = self.fig.canvas.get_renderer()
+        props = self.__text_props(a.text)
+        cache = self.text_metrics if self.text_metrics is not None else textmetrics.default_cache
+        key = cache.key(a.text, matplotlib.rcParams["font.size"], props.get("usetex", matplotlib.rcParams["text.usetex"]),
+                        self.fig.dpi, findfont(FontProperties(family=props.get("fontfamily"))))
 
         # in display units
-        bbox = t.get_window_extent(renderer=self.renderer)
+        cx, cy = self.ax.transData.transform((a.x, a.y))
+        extent = cache.get(key)
+        if extent is not None:
+            self.stats.text_cached += 1
+        else:
+            self.stats.text_measured += 1
+            # put the text on the plot temporarily so that we can determine the width of the text
+            t = self.ax.text(a.x, a.y, a.text, transform=self.ax.transData,
+                             ha='center', va='center', **props)
+
+            if (self.renderer is None):
+                # the extent of text only depends on the dpi, the renderer of the canvas would allocate the whole image
+                from matplotlib.backends.backend_agg import RendererAgg
+                self.renderer = RendererAgg(1, 1, self.fig.dpi)
+
+            bbox = t.get_window_extent(renderer=self.renderer)
+            t.remove()
+            extent = (bbox.x0 - cx, bbox.y0 - cy, bbox.x1 - cx, bbox.y1 - cy)
+            cache.set(key, extent)
+
         # now convert it to data units
-        bbox_data_units = self.ax.transData.inverted().transform(bbox)
-        a.set_bbox(Bbox(bbox_data_units))
-        t.remove()
+        (x0, y0), (x1, y1) = self.ax.transData.inverted().transform(
+            [(cx + extent[0], cy + extent[1]), (cx + extent[2], cy + extent[3])]).tolist()
+        a.set_bbox(Extent(x0, y0, x1, y1))
+
+    def __text_props(self, text):
+        """Internal, extra matplotlib.text.Text properties to draw some text with
+
+        When the tex fast path is enabled, text that does not need LaTeX is drawn with mathtext.
+
+        :param text: The text that will be drawn
+
+        """
+        import matplotlib
+
+        if not (self.tex_fast_path and matplotlib.rcParams["text.usetex"]):
+            return {}
+        family = matplotlib.rcParams["font.family"]
+        if not isinstance(family, str):
+            family = family[0]
+        return tex.fast_path_props(text, family) or {}
+
+    def __set_tick_label_props(self, axis):
+        """Internal, apply __text_props to the tick labels of an axis
+
+        :param axis: A matplotlib.axis.Axis whose ticks have been set
+
+        """
+        locs = axis.get_majorticklocs()
+        labels = axis.get_major_formatter().format_ticks(locs)
+        for tick, label in zip(axis.get_major_ticks(len(locs)), labels):
+            props = self.__text_props(str(label))
+            if props:
+                tick.label1.update(props)
+                tick.label2.update(props)
 
     def __get_label_point(self, hint=None, side=None, default_x=0, default_y=0, is_Era=False):
         """Internal, determine the initial position of the label using the defaults and the hint or side
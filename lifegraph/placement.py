@@ -0,0 +1,385 @@
+from bisect import bisect_left, bisect_right
+import math
+import random
+import time
+
+# columns with at most this many labels are placed by the original greedy pass
+exact_limit = 200
+
+# resolve_annealing only places columns with at most this many labels, larger ones are left to resolve_conflicts
+annealing_limit = 1000
+
+# what resolve_annealing minimizes, the cost of one unit of each, distances are in data units
+weights = {
+    "overlap": 20.0,  # per unit of height two labels overlap by while they are moved, they never overlap in the end
+    "crossing": 10.0,  # per pair of leader lines that cross
+    "displacement": 1.0,  # per unit a label is moved from where it was put
+    "bounds": 100.0,  # per unit a label sticks out of the page
+}
+
+
+def resolve_greedy(annotations, epsilon):
+    """Move labels down until none of them overlap, the same way the original placement did
+
+    Labels are placed in order. Each one is compared with every label placed before it, in the
+    order they were placed, and is moved below any it overlaps, plus epsilon. Labels only ever
+    move down, so a placed label whose bottom is more than epsilon above the top of the label
+    being placed can never touch it, and neither can one that is more than epsilon away in x.
+    The placed labels are kept sorted by their bottom edge so that those are skipped without
+    being compared. The positions are the same as comparing every pair.
+
+    :param annotations: A list of Annotation with their bounding boxes set, in the order they should be placed
+    :param epsilon: The minimum space between two labels in data units
+
+    """
+    placed = []
+    # the bottom edges of the placed labels, sorted, and the index in placed of each one
+    bottoms = []
+    order = []
+    for unchecked in annotations:
+        bbox = unchecked.bbox
+        xmin, xmax = bbox.xmin, bbox.xmax
+        ymin, ymax = bbox.ymin, bbox.ymax
+
+        candidates = sorted(order[bisect_left(bottoms, ymin - epsilon):])
+        for i in candidates:
+            checked, cxmin, cxmax, cymin, cymax = placed[i]
+            if xmin - epsilon > cxmax or cxmin - epsilon > xmax:
+                continue
+            # these are the tests and corrections of Annotation.overlaps, Annotation.get_xy_correction and
+            # Annotation.is_within_epsilon_of, done on floats so they don't go through the Extent
+            if not (xmin >= cxmax or cxmin >= xmax or ymin >= cymax or cymin >= ymax):
+                correction = (0, abs(cymax - ymin) + epsilon)
+                unchecked.update_Y_with_correction(correction)
+                ymin += correction[1]
+                ymax += correction[1]
+            if not (ymin - epsilon > cymax or cymin - epsilon > ymax):
+                correction = (0, epsilon)
+                unchecked.update_Y_with_correction(correction)
+                ymin += correction[1]
+                ymax += correction[1]
+
+        i = bisect_right(bottoms, ymax)
+        bottoms.insert(i, ymax)
+        order.insert(i, len(placed))
+        placed.append((unchecked, xmin, xmax, ymin, ymax))
+    return [p[0] for p in placed]
+
+
+def _x_groups(annotations, epsilon):
+    """Internal, split labels into groups whose x extents can never come within epsilon of each other
+
+    Labels only ever move in y, so labels in different groups can't conflict. The groups keep
+    the order of annotations.
+
+    :param annotations: A list of Annotation with their bounding boxes set
+    :param epsilon: The minimum space between two labels in data units
+
+    """
+    order = sorted(range(len(annotations)), key=lambda i: annotations[i].bbox.xmin)
+    group_of = [0] * len(annotations)
+    group = -1
+    right = None
+    for i in order:
+        bbox = annotations[i].bbox
+        if right is None or bbox.xmin - epsilon > right:
+            group += 1
+            right = bbox.xmax
+        else:
+            right = max(right, bbox.xmax)
+        group_of[i] = group
+
+    groups = [[] for _ in range(group + 1)]
+    for i, a in enumerate(annotations):
+        groups[group_of[i]].append(a)
+    return groups
+
+
+def resolve_indexed(annotations, epsilon):
+    """Move labels down until none of them overlap, using an index of the occupied y ranges
+
+    Labels are placed in order. Each one keeps its position if it is more than epsilon away from
+    every label placed before it. Otherwise it goes in the first free space below its position,
+    2 * epsilon below the label it would overlap, which is where the greedy pass puts it. The
+    occupied y ranges are kept as a sorted list of disjoint blocks. Neighboring blocks whose gap
+    is too small for any label are merged, so a label only looks at a few blocks and placing
+    n labels takes about n * log(n) time.
+
+    Labels are grouped by their x extent first, and labels within a group are treated as if they
+    overlapped in x. The result is close to, but not always the same as, resolve_greedy.
+
+    :param annotations: A list of Annotation with their bounding boxes set, in the order they should be placed
+    :param epsilon: The minimum space between two labels in data units
+
+    """
+    for group in _x_groups(annotations, epsilon):
+        # a gap this small or smaller can't hold any label of the group
+        merge_gap = min(a.bbox.ymax - a.bbox.ymin for a in group) + 2 * epsilon
+        starts = []
+        ends = []
+        for a in group:
+            # the y axis is inverted, so ymax is the bottom of the label and this height is positive
+            height = a.bbox.ymax - a.bbox.ymin
+            y = a.bbox.ymin
+
+            i = bisect_right(starts, y) - 1
+            if i >= 0 and y - ends[i] <= epsilon:
+                y = ends[i] + 2 * epsilon
+            j = i + 1
+            while j < len(starts) and starts[j] - (y + height) <= epsilon:
+                y = ends[j] + 2 * epsilon
+                j += 1
+
+            if y != a.bbox.ymin:
+                a.update_Y_with_correction((0, y - a.bbox.ymin))
+
+            # the label goes between blocks j - 1 and j, merge it with them if the gaps are too small to use
+            start = y
+            end = y + height
+            if j > 0 and start - ends[j - 1] <= merge_gap:
+                start = starts[j - 1]
+                j -= 1
+                del starts[j], ends[j]
+            if j < len(starts) and starts[j] - end <= merge_gap:
+                end = max(end, ends[j])
+                del starts[j], ends[j]
+            starts.insert(j, start)
+            ends.insert(j, end)
+    return annotations
+
+
+def resolve_conflicts(annotations, epsilon):
+    """Move labels down until none of them overlap
+
+    Small inputs use resolve_greedy, so they are placed exactly like they always have been.
+    Inputs with more than exact_limit labels use resolve_indexed.
+
+    :param annotations: A list of Annotation with their bounding boxes set, in the order they should be placed
+    :param epsilon: The minimum space between two labels in data units
+
+    """
+    if len(annotations) <= exact_limit:
+        return resolve_greedy(annotations, epsilon)
+    return resolve_indexed(annotations, epsilon)
+
+
+def resolve_columns(columns, epsilon, resolve, max_workers=None, **kwargs):
+    """Resolve several columns of labels that can't conflict with each other on a thread each
+
+    This is for a resolve function that runs until a deadline, like resolve_annealing, so that
+    the columns can share one deadline instead of splitting it. With a GIL the threads take
+    turns, so each column gets about half of the time while both are running and all of it once
+    the other one is done. Each column is passed to resolve whole, since leader lines of labels
+    that are far apart in x can still cross.
+
+    resolve_conflicts is not run this way. It spends so little time per label that, with a GIL,
+    threads made placing 100000 labels about 25% slower.
+
+    :param columns: A list of lists of Annotation with their bounding boxes set, each in the order it should be placed
+    :param epsilon: The minimum space between two labels in data units
+    :param resolve: A function called with each column, epsilon and kwargs
+    :param max_workers: (Default value = None) The number of threads, see concurrent.futures.ThreadPoolExecutor
+    :param kwargs: Other arguments to resolve
+    :returns: The columns, each in the order its labels were placed
+
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        futures = [pool.submit(resolve, column, epsilon, **kwargs) for column in columns]
+        return [future.result() for future in futures]
+
+
+def _crossings(ax, ay, ex, ey, i):
+    """Internal, which leader lines cross the leader line of label i
+
+    The lines run from the anchor of each label (ax, ay) to its event (ex, ey). Lines that only
+    touch, like two lines to the same event, don't cross.
+
+    :param ax: A numpy array of the x coordinates of the anchors
+    :param ay: A numpy array of the y coordinates of the anchors
+    :param ex: A numpy array of the x coordinates of the events
+    :param ey: A numpy array of the y coordinates of the events
+    :param i: The index of the label
+
+    """
+    def side(px, py, qx, qy, rx, ry):
+        # the sign of the cross product of pq and pr, which side of the line pq r is on
+        return (qx - px) * (ry - py) - (qy - py) * (rx - px)
+
+    d1 = side(ax[i], ay[i], ex[i], ey[i], ax, ay)
+    d2 = side(ax[i], ay[i], ex[i], ey[i], ex, ey)
+    d3 = side(ax, ay, ex, ey, ax[i], ay[i])
+    d4 = side(ax, ay, ex, ey, ex[i], ey[i])
+    cross = (d1 * d2 < 0) & (d3 * d4 < 0)
+    cross[i] = False
+    return cross
+
+
+def resolve_annealing(annotations, epsilon, deadline=None, limits=None, iterations=None, seed=0):
+    """Place labels so that they don't overlap, their leader lines don't cross and they stay close to their events
+
+    The labels are first placed by resolve_conflicts. Simulated annealing then moves them up and
+    down, a label at a time or two neighbors trading places, to lower the sum of the costs in
+    weights. Labels may overlap while they are moved. Every so often, and at the end, the labels
+    are put back in order from the top down, each one pushed below any label above it that it
+    overlaps, and that placement is scored. The best one is only used if it is strictly better
+    than the one of resolve_conflicts: no more overlap, crossings or distance off the page, and
+    a lower cost. Otherwise the labels stay where resolve_conflicts put them, so running out of
+    time is never worse than not optimizing.
+
+    Columns with more than annealing_limit labels are only placed by resolve_conflicts. The
+    deadline is checked while the labels are scored and put back in order, as well as between
+    moves, so the search stops soon after it.
+
+    The search stops after iterations moves or at the deadline, whichever is first. The moves
+    are drawn from a random generator seeded with seed, so the result only depends on the
+    labels, unless the deadline is reached first.
+
+    :param annotations: A list of Annotation with their bounding boxes set, in the order they should be placed
+    :param epsilon: The minimum space between two labels in data units
+    :param deadline: (Default value = None) The time.perf_counter() value to stop at, no limit if None
+    :param limits: (Default value = None) The lowest and highest y a label can reach without leaving the page, in data units
+    :param iterations: (Default value = None) The largest number of moves to try, 200 per label if None
+    :param seed: (Default value = 0) The seed of the random moves
+
+    """
+    import numpy as np
+
+    def expired():
+        return deadline is not None and time.perf_counter() >= deadline
+
+    # displacement is measured from where the labels were put, before the greedy pass moved them
+    start = np.array([a.bbox.ymin for a in annotations], dtype=float)
+    annotations = resolve_conflicts(annotations, epsilon)
+    n = len(annotations)
+    if n < 2 or n > annealing_limit or expired():
+        return annotations
+
+    top = np.array([a.bbox.ymin for a in annotations], dtype=float)
+    height = np.array([a.bbox.ymax - a.bbox.ymin for a in annotations])
+    xmin = np.array([a.bbox.xmin for a in annotations])
+    xmax = np.array([a.bbox.xmax for a in annotations])
+    # labels more than epsilon apart in x never conflict, so only labels of the same x group are compared
+    index = {id(a): i for i, a in enumerate(annotations)}
+    near = [None] * n
+    for group in _x_groups(annotations, epsilon):
+        members = np.array([index[id(a)] for a in group])
+        for i in members.tolist():
+            close = (xmin[members] - epsilon <= xmax[i]) & (xmin[i] - epsilon <= xmax[members]) & (members != i)
+            near[i] = members[close]
+        if expired():
+            return annotations
+    # the leader line starts at relpos on the label, the y axis of the graph is inverted
+    ax = xmin + np.array([a.relpos[0] for a in annotations]) * (xmax - xmin)
+    anchor = np.array([(1 - a.relpos[1]) for a in annotations]) * height
+    ex = np.array([a.event_point.x for a in annotations], dtype=float)
+    ey = np.array([a.event_point.y for a in annotations], dtype=float)
+    low, high = limits if limits is not None else (-math.inf, math.inf)
+
+    def cost(tops, i, y):
+        """The overlap, crossings, displacement and distance off the page of label i if its top were at y"""
+        bottom = y + height[i]
+        others = near[i]
+        gap = np.minimum(bottom, tops[others] + height[others]) - np.maximum(y, tops[others]) + epsilon
+        overlap = float(np.sum(np.maximum(gap, 0)))
+        saved, tops[i] = tops[i], y
+        crossings = int(np.count_nonzero(_crossings(ax, tops + anchor, ex, ey, i)))
+        tops[i] = saved
+        return overlap, crossings, abs(y - start[i]), max(low - y, 0) + max(bottom - high, 0)
+
+    def energy(crossings, displacement, outside):
+        return (weights["crossing"] * crossings + weights["displacement"] * displacement
+                + weights["bounds"] * outside)
+
+    def score(tops):
+        """The overlap, crossings, distance off the page and cost without the overlap of a placement, None at the deadline"""
+        totals = np.zeros(4)
+        for i in range(n):
+            if i % 64 == 0 and expired():
+                return None
+            totals += cost(tops, i, tops[i])
+        # pairs are counted once for each label
+        overlap, crossings, displacement, outside = totals[0] / 2, totals[1] / 2, totals[2], totals[3]
+        return overlap, crossings, outside, energy(crossings, displacement, outside)
+
+    def legalize(tops):
+        """A placement without overlaps, the labels are taken from the top down and pushed below the ones they overlap
+
+        Returns None at the deadline.
+        """
+        legal = tops.copy()
+        placed = np.zeros(n, dtype=bool)
+        for k, i in enumerate(np.argsort(tops, kind="stable").tolist()):
+            if k % 64 == 0 and expired():
+                return None
+            y = legal[i]
+            others = near[i][placed[near[i]]]
+            while len(others):
+                hit = (y - epsilon <= legal[others] + height[others]) & (legal[others] - epsilon <= y + height[i])
+                if not hit.any():
+                    break
+                y = float(np.max(legal[others][hit] + height[others][hit])) + 2 * epsilon
+            legal[i] = y
+            placed[i] = True
+        return legal
+
+    greedy = score(top)
+    if greedy is None:
+        return annotations
+    greedy_overlap, greedy_crossings, greedy_outside, greedy_energy = greedy
+    best, best_energy = None, greedy_energy
+
+    rng = random.Random(seed)
+    iterations = iterations if iterations is not None else 200 * n
+    step = float(np.median(height))
+    # the temperature starts where trading a crossing for some displacement is likely and ends where nothing gets worse
+    hot, cold = weights["crossing"], weights["displacement"] * step / 100
+    began = time.perf_counter()
+    for k in range(iterations):
+        progress = k / iterations
+        if deadline is not None:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            progress = max(progress, (now - began) / (deadline - began))
+        temperature = hot * (cold / hot) ** progress
+
+        i = rng.randrange(n)
+        j = i + rng.choice((-1, 1))
+        if rng.random() < .2 and 0 <= j < n:
+            # trade places with the next label, which untangles crossed leader lines
+            upper, lower = (i, j) if top[i] < top[j] else (j, i)
+            moves = [(upper, top[lower] + height[lower] - height[upper]), (lower, top[upper])]
+        else:
+            # big steps early on, small ones at the end
+            moves = [(i, top[i] + rng.gauss(0, step) * (1 + 4 * (1 - progress)))]
+
+        change = 0
+        old = []
+        for m, y in moves:
+            overlap, crossings, displacement, outside = cost(top, m, y)
+            before = cost(top, m, top[m])
+            change += (weights["overlap"] * (overlap - before[0])
+                       + energy(crossings - before[1], displacement - before[2], outside - before[3]))
+            old.append((m, top[m]))
+            top[m] = y
+        if change > 0 and rng.random() >= math.exp(-change / temperature):
+            for m, y in reversed(old):
+                top[m] = y
+
+        if (k + 1) % n == 0 or k + 1 == iterations:
+            legal = legalize(top)
+            scored = score(legal) if legal is not None else None
+            if scored is None:
+                break
+            overlap, crossings, outside, legal_energy = scored
+            if (overlap <= greedy_overlap + 1e-9 and crossings <= greedy_crossings
+                    and outside <= greedy_outside + 1e-9 and legal_energy < best_energy - 1e-9):
+                best, best_energy = legal, legal_energy
+
+    if best is not None:
+        for a, y in zip(annotations, best.tolist()):
+            if y != a.bbox.ymin:
+                a.update_Y_with_correction((0, y - a.bbox.ymin))
+    return annotations
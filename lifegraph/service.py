@@ -0,0 +1,348 @@
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+
+from . import spec as specs
+from .batch import _init_worker
+
+# the formats a graph can be rendered in and the content type of each
+formats = {
+    "png": "image/png",
+    "pdf": "application/pdf",
+    "svg": "image/svg+xml",
+}
+
+
+# the rcParams a spec sent over HTTP can change, the sizes and colors of the graph. Anything else, like
+# text.usetex, text.latex.preamble or the savefig settings, could reach LaTeX or the filesystem
+allowed_rc_params = frozenset({
+    "axes.labelcolor", "axes.labelsize", "figure.titlesize", "font.size", "lines.linewidth",
+    "lines.markeredgecolor", "lines.markeredgewidth", "lines.markersize", "xtick.color", "xtick.labelsize",
+    "ytick.color", "ytick.labelsize",
+})
+
+# the kinds of items a spec sent over HTTP can hold, image reads a file from the disk of the server
+allowed_items = frozenset(specs.items).difference({"image"})
+
+
+class SpecError(ValueError):
+    """A spec that could not be built into a graph, the client gets a 400 for it"""
+
+
+def check(spec):
+    """Refuse a spec a client over HTTP must not send, before it is queued
+
+    Only the rcParams in allowed_rc_params and the items in allowed_items can be used. The rest
+    of the spec is checked when it is built by a worker.
+
+    :param spec: A dict, see lifegraph.spec.build
+    :raises SpecError: If the spec uses anything else
+
+    """
+    if not isinstance(spec, dict):
+        raise SpecError("A spec must be a JSON object")
+    settings = spec.get("settings", {})
+    if not isinstance(settings, dict) or not isinstance(settings.get("rcParams", {}), dict):
+        raise SpecError("settings and settings.rcParams must be JSON objects")
+    refused = set(settings.get("rcParams", {})).difference(allowed_rc_params)
+    if refused:
+        raise SpecError(f"The rcParams {sorted(refused)} can't be set, only {', '.join(sorted(allowed_rc_params))}")
+    items = spec.get("items", [])
+    if not isinstance(items, list):
+        raise SpecError("items must be a JSON array")
+    for i, item in enumerate(items):
+        if isinstance(item, dict) and item.get("kind") in specs.items and item["kind"] not in allowed_items:
+            raise SpecError(f"Item {i} has kind {item['kind']!r}, which can't be rendered by the service")
+
+
+def _render(spec, fmt, allow_tex=False):
+    """Internal, render a spec inside of a worker and return the encoded file
+
+    :param spec: A dict, see lifegraph.spec.build
+    :param fmt: One of formats
+    :param allow_tex: (Default value = False) If False, the graph is drawn without LaTeX
+    :raises SpecError: If the spec is not valid
+
+    """
+    import random
+
+    # events without a color get a random one, the same spec should always look the same
+    random.seed(specs.key(spec))
+    try:
+        graph = specs.build(spec, use_pyplot=False)
+    except Exception as e:
+        # a spec can fail in more ways than build checks for, like settings that are not a dict
+        raise SpecError(str(e) if isinstance(e, ValueError) else f"{type(e).__name__}: {e}") from None
+    if not allow_tex:
+        # LaTeX reads any file a label names with \input, text from a client is drawn with mathtext instead
+        graph.settings.rcParams["text.usetex"] = False
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+    os.close(fd)
+    try:
+        graph.save(path)
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        graph.close()
+        os.remove(path)
+
+
+class RenderService:
+    """Renders specs over a pool of processes for many concurrent clients
+
+    Requests for the same spec and format that arrive while it is being rendered wait for that
+    render instead of starting another one. Up to queue_size renders can wait for a worker on top
+    of the ones that are running; when that many are waiting, new renders are refused until there
+    is room again.
+
+    Specs come from the network, so the workers are limited to max_memory, specs sent over HTTP
+    are checked with check, and graphs are drawn without LaTeX unless allow_tex is True.
+    """
+
+    def __init__(self, processes=None, queue_size=16, max_body=1 << 20, chunk_size=1 << 16, max_memory=1 << 31,
+                 allow_tex=False):
+        """Initialize the RenderService class
+
+        :param processes: (Default value = None) The number of worker processes, os.cpu_count() if None
+        :param queue_size: (Default value = 16) The number of renders that can wait for a worker
+        :param max_body: (Default value = 1 MB) The largest spec accepted over HTTP, in bytes
+        :param chunk_size: (Default value = 64 KB) The size of the chunks a file is streamed back in
+        :param max_memory: (Default value = 2 GB) The maximum address space of each worker in bytes, no limit if None. A render that needs more fails with a 500
+        :param allow_tex: (Default value = False) If True, text is drawn with LaTeX like the papersize says. Only for clients you trust, LaTeX can read files on the server
+
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.max_body = max_body
+        self.chunk_size = chunk_size
+        self.max_memory = max_memory
+        self.allow_tex = allow_tex
+        # the number of renders finished, requests that joined one already running, and requests refused
+        self.rendered = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.pool = None
+        self.queue = None
+        # the renders that are queued or running
+        self._pending = 0
+        self._inflight = {}
+        self._workers = []
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8000):
+        """Start the worker processes and listen for HTTP requests
+
+        :param host: (Default value = "127.0.0.1") The address to listen on
+        :param port: (Default value = 8000) The port to listen on, 0 picks a free one
+
+        """
+        self.pool = ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(self.max_memory,))
+        self.queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self.__dispatch()) for _ in range(self.processes)]
+        self._server = await asyncio.start_server(self.__handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """Serve requests until the task is cancelled"""
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop listening, cancel the renders that have not started and shut the workers down"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self.pool is not None:
+            # waits for the running renders, which must not block the event loop
+            await asyncio.to_thread(self.pool.shutdown, cancel_futures=True)
+            self.pool = None
+
+    async def render(self, spec, fmt="png"):
+        """Render a spec, or wait for the render of an identical one that is already running
+
+        :param spec: A dict, see lifegraph.spec.build
+        :param fmt: (Default value = "png") One of formats
+        :returns: A tuple of the encoded file and True if an identical request was already being rendered
+        :raises asyncio.QueueFull: If every worker is busy and the queue is full
+
+        """
+        if fmt not in formats:
+            raise ValueError(f"Can't render '{fmt}', the format must be one of {', '.join(formats)}")
+        key = specs.key({"spec": spec, "format": fmt})
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # a client that goes away must not cancel the render for the others
+            return await asyncio.shield(future), True
+
+        # counted here rather than by the size of the queue, a render leaves the queue before a worker is free
+        if self._pending >= self.processes + self.queue_size:
+            self.rejected += 1
+            raise asyncio.QueueFull()
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((spec, fmt, future))
+        self._pending += 1
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future), False
+
+    async def __dispatch(self):
+        """Internal, hand queued renders to the pool, one at a time per worker process"""
+        loop = asyncio.get_running_loop()
+        while True:
+            spec, fmt, future = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.pool, _render, spec, fmt, self.allow_tex)
+                future.set_result(result)
+                self.rendered += 1
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                # retrieved here so that a render nobody waits for anymore isn't reported as unhandled
+                future.exception()
+            finally:
+                self._pending -= 1
+                self.queue.task_done()
+
+    def stats(self):
+        """The counters of the service as a dict that can be written as json"""
+        return {
+            "processes": self.processes,
+            "pending": self._pending,
+            "queue_size": self.queue_size,
+            "inflight": len(self._inflight),
+            "rendered": self.rendered,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+        }
+
+    async def __handle(self, reader, writer):
+        """Internal, answer one HTTP request
+
+        POST /render?format=png renders the JSON spec in the body and streams the file back with
+        chunked transfer encoding. GET /health returns the stats of the service.
+        """
+        try:
+            try:
+                status, headers, body = await self.__respond(reader)
+            except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                raise
+            except Exception as e:
+                status, headers, body = "500 Internal Server Error", {}, f"{type(e).__name__}: {e}"
+            if isinstance(body, str):
+                body = body.encode()
+                headers.setdefault("Content-Type", "text/plain; charset=utf-8")
+            head = [f"HTTP/1.1 {status}", "Connection: close", "Transfer-Encoding: chunked"]
+            head += [f"{name}: {value}" for name, value in headers.items()]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode())
+            for start in range(0, len(body), self.chunk_size):
+                chunk = body[start:start + self.chunk_size]
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                # wait for slow clients instead of buffering the whole file
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def __respond(self, reader):
+        """Internal, read a request and return the status, headers and body of the response
+
+        :param reader: The asyncio.StreamReader of the connection
+
+        """
+        request = (await reader.readline()).decode("latin-1").split()
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if len(request) != 3:
+            return "400 Bad Request", {}, "Malformed request line"
+
+        method, target, _ = request
+        url = urlsplit(target)
+        if url.path == "/health":
+            if method != "GET":
+                return "405 Method Not Allowed", {"Allow": "GET"}, ""
+            return "200 OK", {"Content-Type": "application/json"}, json.dumps(self.stats())
+        if url.path != "/render":
+            return "404 Not Found", {}, f"No such path {url.path}, use POST /render or GET /health"
+        if method != "POST":
+            return "405 Method Not Allowed", {"Allow": "POST"}, ""
+
+        try:
+            length = int(headers.get("content-length", ""))
+        except ValueError:
+            return "411 Length Required", {}, "A Content-Length header is required"
+        if length > self.max_body:
+            return "413 Payload Too Large", {}, f"The spec is larger than {self.max_body} bytes"
+        fmt = parse_qs(url.query).get("format", ["png"])[-1]
+        if fmt not in formats:
+            return "400 Bad Request", {}, f"Unknown format '{fmt}', it must be one of {', '.join(formats)}"
+
+        try:
+            spec = json.loads(await reader.readexactly(length))
+            check(spec)
+        except ValueError as e:
+            return "400 Bad Request", {}, f"Invalid spec: {e}"
+
+        try:
+            # the spec is built in the worker, so a large one does not hold up the event loop
+            data, coalesced = await self.render(spec, fmt)
+        except SpecError as e:
+            return "400 Bad Request", {}, f"Invalid spec: {e}"
+        except asyncio.QueueFull:
+            return "503 Service Unavailable", {"Retry-After": "1"}, "Every worker is busy and the queue is full"
+        except Exception as e:
+            return "500 Internal Server Error", {}, f"Rendering failed: {type(e).__name__}: {e}"
+        return "200 OK", {"Content-Type": formats[fmt], "X-Lifegraph-Coalesced": "yes" if coalesced else "no"}, data
+
+
+async def serve(host="127.0.0.1", port=8000, processes=None, queue_size=16, max_memory=1 << 31, allow_tex=False):
+    """Run a RenderService until the task is cancelled
+
+    :param host: (Default value = "127.0.0.1") The address to listen on
+    :param port: (Default value = 8000) The port to listen on
+    :param processes: (Default value = None) The number of worker processes, os.cpu_count() if None
+    :param queue_size: (Default value = 16) The number of renders that can wait for a worker
+    :param max_memory: (Default value = 2 GB) The maximum address space of each worker in bytes, see RenderService
+    :param allow_tex: (Default value = False) If True, text is drawn with LaTeX, see RenderService
+
+    """
+    service = RenderService(processes=processes, queue_size=queue_size, max_memory=max_memory, allow_tex=allow_tex)
+    host, port = await service.start(host, port)
+    print(f"Rendering lifegraphs on http://{host}:{port}/render")
+    await service.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render lifegraph specs over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--max-memory", type=int, default=1 << 31, help="bytes of address space per worker, 0 for no limit")
+    parser.add_argument("--allow-tex", action="store_true", help="draw text with LaTeX, only for trusted clients")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.processes, args.queue_size, args.max_memory or None, args.allow_tex))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,354 @@
+from datetime import date
+import hashlib
+import json
+
+from .configuration import Papersize
+from .lifegraph import GridMode, Lifegraph, Point, Side
+
+# the version of the spec format written by describe and read by build
+version = 1
+
+
+def _enum(enum, value, name):
+    """Internal, look up a member of an enum by name
+
+    :param enum: The Enum class
+    :param value: The name of the member
+    :param name: The name of the field, for the error message
+
+    """
+    try:
+        return enum[value]
+    except (KeyError, TypeError):
+        raise ValueError(f"'{value}' is not a valid {name}, it must be one of {', '.join(enum.__members__)}")
+
+
+def _number(value):
+    """Internal, check that a value is an int or a float, keeping which of the two it is
+
+    :param value: The number
+
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Expected a number, not {value!r}")
+    return value
+
+
+def _integer(value):
+    """Internal, check that a value is a whole number, a float like 90.0 is read as 90
+
+    :param value: The number
+
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"Expected a whole number, not {value!r}")
+    return value
+
+
+def _bool(value):
+    """Internal, check that a value is true or false, so that a string like "false" is not read as True
+
+    :param value: The boolean
+
+    """
+    if not isinstance(value, bool):
+        raise ValueError(f"Expected true or false, not {value!r}")
+    return value
+
+
+def _rect(value):
+    """Internal, read [left, bottom, width, height] as a list of four numbers
+
+    :param value: A list of four numbers
+
+    """
+    if not isinstance(value, (list, tuple)) or len(value) != 4:
+        raise ValueError(f"Expected [left, bottom, width, height], not {value!r}")
+    return [_number(v) for v in value]
+
+
+def _fontsize(value):
+    """Internal, read a font size, a number of points or a name like "large"
+
+    :param value: The font size
+
+    """
+    return value if isinstance(value, str) else _number(value)
+
+
+def _date(value):
+    """Internal, read an ISO 8601 date (YYYY-MM-DD)
+
+    :param value: The date as a string
+
+    """
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{value}' is not a date, dates are written as YYYY-MM-DD")
+
+
+def _color(value):
+    """Internal, read a color, a list of numbers is an RGB or RGBA tuple
+
+    :param value: A matplotlib color name, a hex string or a list of numbers
+
+    """
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _point(value):
+    """Internal, read a hint given as [x, y] in data coordinates
+
+    :param value: A list of two numbers
+
+    """
+    if not isinstance(value, list) or len(value) != 2:
+        raise ValueError(f"A hint is written as [x, y], not {value!r}")
+    return Point(*value)
+
+
+def _side(value):
+    """Internal, read "left" or "right" as a Side
+
+    :param value: The name of the side
+
+    """
+    return _enum(Side, str(value).upper(), "side")
+
+
+def _list(read):
+    """Internal, a reader for a list of values, where None is kept as None
+
+    :param read: The reader of each value
+
+    """
+    def read_list(values):
+        if not isinstance(values, list):
+            raise ValueError(f"Expected a list, not {values!r}")
+        return [None if v is None else read(v) for v in values]
+    return read_list
+
+
+def _dates(values):
+    """Internal, read a list of ISO 8601 dates, they are converted all at once by Lifegraph.add_life_events
+
+    :param values: A list of YYYY-MM-DD strings
+
+    """
+    if not isinstance(values, list):
+        raise ValueError(f"Expected a list of dates, not {values!r}")
+    return values
+
+
+# the arguments of Lifegraph a spec can set besides the birthdate, and how each is read
+_options = {
+    "size": lambda v: _enum(Papersize, v, "size"),
+    "dpi": _number,
+    "label_space_epsilon": _number,
+    "max_age": _integer,
+    "axes_rect": _rect,
+    "grid_mode": lambda v: _enum(GridMode, v, "grid_mode"),
+    "tex_fast_path": _bool,
+    "placement_budget": _number,
+}
+
+# every kind of item, the Lifegraph method it calls and how each of its fields is read
+items = {
+    "life_event": ("add_life_event", {"text": str, "date": _date, "color": _color, "hint": _point, "side": _side,
+                                      "color_square": bool}),
+    "life_events": ("add_life_events", {"texts": _list(str), "dates": _dates, "colors": _list(_color),
+                                        "side": _list(_side), "color_square": bool}),
+    "era": ("add_era", {"text": str, "start_date": _date, "end_date": _date, "color": _color, "side": _side,
+                        "alpha": _number}),
+    "era_span": ("add_era_span", {"text": str, "start_date": _date, "end_date": _date, "color": _color, "hint": _point,
+                                  "side": _side, "color_start_and_end_markers": bool}),
+    "title": ("add_title", {"text": str, "fontsize": _fontsize}),
+    "watermark": ("add_watermark", {"text": str}),
+    "image": ("add_image", {"image_name": str, "alpha": _number}),
+    "max_age_label": ("show_max_age_label", {}),
+    "x_axis": ("format_x_axis", {"text": str, "positionx": _number, "positiony": _number, "color": _color, "fontsize": _fontsize}),
+    "y_axis": ("format_y_axis", {"text": str, "positionx": _number, "positiony": _number, "color": _color, "fontsize": _fontsize}),
+}
+
+
+def build(spec, **kwargs):
+    """Create a Lifegraph from a spec
+
+    A spec is a dict that can be written as JSON:
+
+        {"version": 1, "birthdate": "1990-11-01", "size": "A4", "dpi": 300,
+         "settings": {"rcParams": {"text.usetex": false}},
+         "items": [{"kind": "title", "text": "Our Life"},
+                   {"kind": "life_event", "text": "Married", "date": "2010-02-14", "color": "#DC143C"},
+                   {"kind": "era", "text": "College", "start_date": "2009-09-01", "end_date": "2013-12-14"}]}
+
+    Every item calls the Lifegraph method named in items with the rest of its fields as
+    arguments, in the order of the list. Dates are written as YYYY-MM-DD, sides as "left" or
+    "right" and hints as [x, y].
+
+    :param spec: A dict as described above
+    :param kwargs: Other arguments to Lifegraph, e.g. use_pyplot=False
+    :returns: A Lifegraph that has not been drawn
+
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("A spec must be a JSON object")
+    if spec.get("version", version) != version:
+        raise ValueError(f"Spec version {spec['version']} is not supported, the current version is {version}")
+    unknown = set(spec).difference({"version", "birthdate", "settings", "items", *_options})
+    if unknown:
+        raise ValueError(f"Unknown spec fields {sorted(unknown)}")
+    if "birthdate" not in spec:
+        raise ValueError("A spec needs a birthdate")
+
+    options = {}
+    for name, read in _options.items():
+        if name in spec:
+            try:
+                options[name] = read(spec[name])
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{name}: {e}") from e
+
+    settings = spec.get("settings", {})
+    if not isinstance(settings, dict):
+        raise ValueError(f"settings: Expected an object, not {settings!r}")
+    for group, values in settings.items():
+        if group not in ("rcParams", "otherParams"):
+            raise ValueError(f"Unknown settings '{group}', it must be rcParams or otherParams")
+        if not isinstance(values, dict):
+            raise ValueError(f"settings.{group}: Expected an object, not {values!r}")
+    if "figure.dpi" in settings.get("rcParams", {}):
+        raise ValueError("settings.rcParams can't set figure.dpi, use the dpi field of the spec")
+
+    graph = Lifegraph(_date(spec["birthdate"]), **options, **kwargs)
+    for group, values in settings.items():
+        for key, value in values.items():
+            # tuples are written as lists in JSON
+            getattr(graph.settings, group)[key] = tuple(value) if isinstance(value, list) else value
+
+    for i, item in enumerate(spec.get("items", [])):
+        kind = item.get("kind") if isinstance(item, dict) else None
+        if kind not in items:
+            raise ValueError(f"Item {i} has kind {kind!r}, it must be one of {', '.join(items)}")
+        method, fields = items[kind]
+        # one pass over the fields checks and reads them, this loop runs for every event of every spec
+        arguments = {}
+        try:
+            for name, value in item.items():
+                read = fields.get(name)
+                if read is not None:
+                    if value is not None:
+                        arguments[name] = read(value)
+                elif name != "kind":
+                    raise ValueError(f"unknown field '{name}'")
+            getattr(graph, method)(**arguments)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Item {i} ({kind}): {e}") from e
+    return graph
+
+
+def _plain(value):
+    """Internal, turn an argument of a public method into the value a spec holds
+
+    :param value: A date, Side, Point, color, list or array of dates
+
+    """
+    if isinstance(value, (date, Side)):
+        return value.isoformat() if isinstance(value, date) else value.name.lower()
+    if isinstance(value, Point):
+        return [value.x, value.y]
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if hasattr(value, "dtype"):
+        # the datetime64[D] array of Lifegraph.add_life_events
+        return value.astype(str).tolist() if value.dtype.kind == "M" else value.tolist()
+    return value
+
+
+def describe(graph, calls):
+    """The spec of a graph, see Lifegraph.to_spec
+
+    :param graph: A Lifegraph
+    :param calls: The (kind, arguments) of every call to a public method of the graph, in order
+
+    """
+    spec = {
+        "version": version,
+        "birthdate": graph.birthdate.isoformat(),
+        "size": graph.size.name,
+        "dpi": graph.settings.rcParams["figure.dpi"],
+        "label_space_epsilon": graph.label_space_epsilon,
+        "max_age": graph.ymax,
+        "axes_rect": list(graph.axes_rect),
+        "grid_mode": graph.grid_mode.name,
+        "tex_fast_path": graph.tex_fast_path,
+    }
+    if graph.placement_budget is not None:
+        spec["placement_budget"] = graph.placement_budget
+    # only what was changed on this graph, the defaults of the papersize come from the library
+    # the dpi is written once, as the dpi field
+    settings = {group: {key: _plain(value) for key, value in getattr(graph.settings, group).maps[0].items()
+                        if (group, key) != ("rcParams", "figure.dpi")}
+                for group in ("rcParams", "otherParams")}
+    spec["settings"] = {group: values for group, values in settings.items() if values}
+    spec["items"] = [{"kind": kind, **{name: _plain(value) for name, value in arguments.items() if value is not None}}
+                     for kind, arguments in calls]
+    return spec
+
+
+def dumps(spec, binary=False):
+    """Encode a spec
+
+    :param spec: A dict, see build
+    :param binary: (Default value = False) If True, encode the spec with msgpack, which is smaller and faster to load than JSON. The msgpack package has to be installed
+    :returns: JSON text, or msgpack bytes if binary is True
+
+    """
+    if binary:
+        return _msgpack().packb(spec, use_bin_type=True)
+    return json.dumps(spec, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data):
+    """Decode a spec encoded by dumps, the encoding is detected
+
+    :param data: JSON text or bytes, or msgpack bytes
+
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+    data = bytes(data)
+    # a JSON object starts with {, a msgpack map with a byte of 0x80 or above
+    if data.lstrip()[:1] == b"{":
+        return json.loads(data)
+    return _msgpack().unpackb(data, raw=False)
+
+
+def _msgpack():
+    """Internal, import msgpack, which is only needed for the binary encoding"""
+    try:
+        import msgpack
+    except ImportError:
+        raise ValueError("The binary spec encoding needs the msgpack package, install it with pip install msgpack")
+    return msgpack
+
+
+def canonical(spec):
+    """The spec as compact JSON with sorted keys, equal specs give equal bytes
+
+    :param spec: A dict, see build
+
+    """
+    return json.dumps(spec, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def key(spec):
+    """A hash of the canonical JSON of a spec
+
+    :param spec: A dict, see build
+
+    """
+    return hashlib.sha1(canonical(spec)).hexdigest()
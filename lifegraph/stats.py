@@ -0,0 +1,80 @@
+from contextlib import contextmanager
+import logging
+import time
+
+# every render is logged at DEBUG level, enable it with logging.getLogger("lifegraph").setLevel(logging.DEBUG)
+logger = logging.getLogger("lifegraph")
+
+
+class RenderStats:
+    """Where the time of one save or show went
+
+    Phases are named after the step of the render they time. A phase named "a.b" is part of the
+    phase "a", e.g. "draw.annotations.measure" is included in "draw.annotations", which is part of
+    "draw". A phase that runs more than once in a render, like measuring every label, is the sum of
+    all of its runs.
+    """
+
+    def __init__(self):
+        """Initialize the RenderStats class"""
+        # the seconds spent in each phase, in the order they first ran
+        self.phases = {}
+        # the number of artists added to the figure by each layer
+        self.artists = {}
+        # the number of labels measured with matplotlib and the number read from the text metrics cache
+        self.text_measured = 0
+        self.text_cached = 0
+        # True if the figure was drawn from scratch, False if only the parts that changed were redrawn
+        self.full_draw = None
+        # "hit" or "miss" if the render cache was used, nothing is drawn on a hit
+        self.render_cache = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time a phase of the render
+
+        :param name: The name of the phase
+
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + time.perf_counter() - start
+
+    def count_artists(self, layer, count):
+        """Count artists added to the figure
+
+        :param layer: The part of the graph the artists were drawn for
+        :param count: The number of artists
+
+        """
+        self.artists[layer] = self.artists.get(layer, 0) + count
+
+    @property
+    def total(self):
+        """The seconds spent in the top level phases"""
+        return sum(t for name, t in self.phases.items() if "." not in name)
+
+    def as_dict(self):
+        """The stats as a dict that can be written as json"""
+        return {
+            "total": self.total,
+            "phases": dict(self.phases),
+            "artists": dict(self.artists),
+            "text_measured": self.text_measured,
+            "text_cached": self.text_cached,
+            "full_draw": self.full_draw,
+            "render_cache": self.render_cache,
+        }
+
+    def __repr__(self):
+        """Print a description of the RenderStats class"""
+        phases = ", ".join(f"{name} {t:.3f}s" for name, t in self.phases.items())
+        artists = sum(self.artists.values())
+        return (f"RenderStats {self.total:.3f}s ({phases}), {artists} artists, "
+                f"{self.text_measured} labels measured, {self.text_cached} from cache")
+
+    def __str__(self):
+        """Print a description of the RenderStats class"""
+        return self.__repr__()
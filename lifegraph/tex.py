@@ -0,0 +1,121 @@
+from functools import lru_cache
+from pathlib import Path
+import os
+
+# the Computer Modern fonts shipped with matplotlib that match what LaTeX uses for each family
+fast_path_fonts = {
+    "serif": "cmr10",
+    "sans-serif": "cmss10",
+    "monospace": "cmtt10",
+}
+
+# the font LaTeX uses for digits and upright text inside of math mode
+math_font = "cmr10"
+
+# characters and sequences that LaTeX does not print literally outside of math mode
+_special_text = ("\\", "#", "%", "&", "~", "_", "^", "{", "}", "<", ">", "|", "\"", "--", "``", "''")
+
+
+def use_tex_cache(directory):
+    """Keep the files matplotlib renders with LaTeX in a directory of your choosing
+
+    matplotlib already names the output of every LaTeX and dvipng run by a hash of its source
+    and reuses it from then on. Pointing every process of a render farm at the same directory
+    means each fragment is only rendered once for all of them.
+
+    The only public way to move the cache is to set MPLCONFIGDIR before matplotlib is imported,
+    which moves every other matplotlib file as well. This sets the attribute TexManager reads the
+    location from instead, which is private in recent versions of matplotlib: _cache_dir, or
+    _texcache in the versions that privatized texcache first. A RuntimeError is raised if a
+    version has none of them, rather than silently keeping the default location.
+
+    :param directory: The directory to keep the rendered TeX in. It is created if it does not exist
+
+    """
+    from matplotlib.texmanager import TexManager
+
+    os.makedirs(directory, exist_ok=True)
+    if isinstance(vars(TexManager).get("_cache_dir"), Path):
+        TexManager._cache_dir = Path(directory)
+    elif isinstance(vars(TexManager).get("_texcache"), str):
+        TexManager._texcache = str(directory)
+    elif isinstance(vars(TexManager).get("texcache"), str):
+        TexManager.texcache = str(directory)
+    else:
+        raise RuntimeError("This version of matplotlib does not let the TeX cache be moved, set MPLCONFIGDIR instead")
+
+
+def split_math(text):
+    """Split text into (is_math, segment) pairs on unescaped dollar signs
+
+    Returns None if the dollar signs are not balanced.
+
+    :param text: The text of a label
+
+    """
+    segments = []
+    current = []
+    in_math = False
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c == "\\" and i + 1 < len(text):
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if c == "$":
+            segments.append((in_math, "".join(current)))
+            current = []
+            in_math = not in_math
+        else:
+            current.append(c)
+        i += 1
+    if in_math:
+        return None
+    segments.append((False, "".join(current)))
+    return [(is_math, s) for is_math, s in segments if s]
+
+
+@lru_cache(maxsize=4096)
+def needs_tex(text):
+    """Returns True if text can only be drawn faithfully by LaTeX
+
+    Text outside of math mode must be plain ASCII without any character LaTeX treats specially,
+    and everything inside of math mode must be understood by matplotlib's mathtext.
+
+    :param text: The text of a label
+
+    """
+    segments = split_math(text)
+    if segments is None:
+        return True
+
+    from matplotlib.mathtext import MathTextParser
+    parser = MathTextParser("path")
+    for is_math, segment in segments:
+        if is_math:
+            try:
+                parser.parse(f"${segment}$")
+            except ValueError:
+                return True
+        elif not segment.isascii() or any(s in segment for s in _special_text):
+            return True
+    return False
+
+
+def fast_path_props(text, family):
+    """The Text properties that draw text with mathtext instead of LaTeX, or None if it needs LaTeX
+
+    Text made only of math is set in the font LaTeX uses in math mode. Anything else uses the
+    Computer Modern font of the family LaTeX would have picked. LaTeX ignores the font weight,
+    so the weight is reset as well.
+
+    :param text: The text of a label
+    :param family: The first entry of the font.family rcParam
+
+    """
+    if family not in fast_path_fonts or needs_tex(text):
+        return None
+    segments = split_math(text)
+    only_math = bool(segments) and all(is_math for is_math, _ in segments)
+    return {"usetex": False, "fontfamily": math_font if only_math else fast_path_fonts[family], "weight": "normal"}
@@ -0,0 +1,124 @@
+from collections import OrderedDict
+import json
+import os
+import tempfile
+import threading
+
+
+class TextMetricsCache:
+    """Remembers the size of rendered text so that labels are only measured once.
+
+    Measuring a label means laying it out with matplotlib, which starts a LaTeX run when
+    text.usetex is set. The extent of a label only depends on its text, font, whether TeX is
+    used and the dpi, so the result is kept under those values. The extent is stored relative to
+    the point the text is centered on, in display units, which makes it independent of where the
+    label ends up on the graph. The most recently used max_entries extents are kept, so a cache
+    shared by a long running process doesn't grow without bound.
+    """
+
+    def __init__(self, path=None, max_entries=100000):
+        """Initialize the TextMetricsCache class
+
+        :param path: (Default value = None) A json file to persist the cache to. If it exists, it is loaded
+        :param max_entries: (Default value = 100000) The number of extents kept, or None for no limit
+
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.extents = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    @staticmethod
+    def key(text, fontsize, usetex, dpi, font):
+        """Build the key a text extent is stored under
+
+        :param text: The text of the label
+        :param fontsize: The font size in points
+        :param usetex: True if the text is rendered with LaTeX
+        :param dpi: The dots per inch of the figure
+        :param font: Something describing the font family, e.g. the font file matplotlib resolved
+
+        """
+        return (text, float(fontsize), bool(usetex), float(dpi), str(font))
+
+    def get(self, key):
+        """Return the extent stored for key or None
+
+        :param key: A key returned by TextMetricsCache.key
+
+        """
+        with self._lock:
+            extent = self.extents.get(key)
+            if extent is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.extents.move_to_end(key)
+        return extent
+
+    def set(self, key, extent):
+        """Store the extent of some text
+
+        :param key: A key returned by TextMetricsCache.key
+        :param extent: A tuple (x0, y0, x1, y1) in display units relative to the center of the text
+
+        """
+        with self._lock:
+            self.extents[key] = tuple(extent)
+            self.extents.move_to_end(key)
+            # forget the least recently used extents
+            while self.max_entries is not None and len(self.extents) > self.max_entries:
+                self.extents.popitem(last=False)
+
+    def clear(self):
+        """Forget every stored extent"""
+        with self._lock:
+            self.extents.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def load(self, path=None):
+        """Add the extents stored in a json file to the cache
+
+        :param path: (Default value = None) The file to read, the path of the cache if None
+
+        """
+        with open(path or self.path) as f:
+            for key, extent in json.load(f):
+                self.set(tuple(key), extent)
+
+    def save(self, path=None):
+        """Write the cache to a json file
+
+        :param path: (Default value = None) The file to write, the path of the cache if None
+
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("A path is required to save the text metrics cache")
+        with self._lock:
+            items = [[list(key), list(extent)] for key, extent in list(self.extents.items())]
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(items, f)
+            os.replace(tmp, path)
+
+    def __getstate__(self):
+        """Leave the lock out when the cache is pickled"""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        """Recreate the lock when the cache is unpickled"""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+# used by every Lifegraph that is not given its own cache
+default_cache = TextMetricsCache()
@@ -0,0 +1,205 @@
+import struct
+import zlib
+
+import numpy as np
+
+# the largest amount of compressed data written in one IDAT chunk of a png
+idat_size = 1 << 20
+
+
+class PngWriter:
+    """Writes an 8 bit RGBA png one band of rows at a time
+
+    The rows are compressed as they arrive, so only the band being written and the state of the
+    compressor are held in memory.
+    """
+
+    def __init__(self, f, width, height, dpi):
+        """Initialize the PngWriter class
+
+        :param f: A file opened for writing in binary mode
+        :param width: The width of the image in pixels
+        :param height: The height of the image in pixels
+        :param dpi: The resolution stored in the pHYs chunk
+
+        """
+        self.f = f
+        self.width = width
+        self.height = height
+        self.rows = 0
+        self._compressor = zlib.compressobj(6)
+        self._pending = []
+        self._pending_size = 0
+
+        f.write(b"\x89PNG\r\n\x1a\n")
+        # 8 bits per sample, color type 6 is RGBA, default compression, filter and no interlacing
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        # pixels per meter, unit 1 is the meter
+        ppm = round(dpi / 0.0254)
+        self._chunk(b"pHYs", struct.pack(">IIB", ppm, ppm, 1))
+
+    def _chunk(self, kind, data):
+        """Internal, write a chunk with its length and checksum
+
+        :param kind: The four letter type of the chunk
+        :param data: The bytes of the chunk
+
+        """
+        self.f.write(struct.pack(">I", len(data)))
+        self.f.write(kind)
+        self.f.write(data)
+        self.f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+    def _flush(self, data, force=False):
+        """Internal, write compressed data in IDAT chunks of about idat_size bytes
+
+        :param data: Compressed bytes
+        :param force: (Default value = False) If True, write whatever is left
+
+        """
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+        if self._pending_size >= idat_size or (force and self._pending_size):
+            self._chunk(b"IDAT", b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def write(self, band):
+        """Add the next rows of the image
+
+        :param band: A uint8 array of shape (rows, width, 4)
+
+        """
+        rows = band.shape[0]
+        if band.shape[1:] != (self.width, 4):
+            raise ValueError(f"Expected rows of {self.width} RGBA pixels, got an array of shape {band.shape}")
+        if self.rows + rows > self.height:
+            raise ValueError(f"The image is only {self.height} rows high")
+        # every row starts with its filter type, 0 leaves the row as it is
+        filtered = np.zeros((rows, 1 + self.width * 4), dtype=np.uint8)
+        filtered[:, 1:] = band.reshape(rows, -1)
+        self._flush(self._compressor.compress(filtered.tobytes()))
+        self.rows += rows
+
+    def close(self):
+        """Finish the image, every row must have been written"""
+        if self.rows != self.height:
+            raise ValueError(f"Only {self.rows} of {self.height} rows were written")
+        self._flush(self._compressor.flush(), force=True)
+        self._chunk(b"IEND", b"")
+
+
+class TiffWriter:
+    """Writes an uncompressed 8 bit RGBA baseline tiff one band of rows at a time
+
+    Each band is a strip of the image, all of them but the last must have the same number of rows.
+    The directory that lists the strips is written after the last one, so the file has to be
+    seekable. Offsets are 32 bit, which limits the image to 4 GB.
+    """
+
+    def __init__(self, f, width, height, dpi):
+        """Initialize the TiffWriter class
+
+        :param f: A file opened for writing in binary mode
+        :param width: The width of the image in pixels
+        :param height: The height of the image in pixels
+        :param dpi: The resolution stored in the XResolution and YResolution tags
+
+        """
+        if width * height * 4 >= 1 << 32:
+            raise ValueError("A tiff file can't be larger than 4 GB, use a png file or a lower dpi")
+        self.f = f
+        self.width = width
+        self.height = height
+        self.dpi = dpi
+        # the number of rows in every strip but the last, set by the first band
+        self.rows_per_strip = None
+        self.rows = 0
+        self._strips = []
+
+        self._start = f.tell()
+        # little endian, the offset of the directory is filled in by close
+        f.write(b"II*\x00\x00\x00\x00\x00")
+
+    def write(self, band):
+        """Add the next rows of the image
+
+        :param band: A uint8 array of shape (rows, width, 4)
+
+        """
+        rows = band.shape[0]
+        if band.shape[1:] != (self.width, 4):
+            raise ValueError(f"Expected rows of {self.width} RGBA pixels, got an array of shape {band.shape}")
+        if self.rows + rows > self.height:
+            raise ValueError(f"The image is only {self.height} rows high")
+        if self.rows_per_strip is None:
+            self.rows_per_strip = rows
+        elif self._strips[-1][1] != self.rows_per_strip * self.width * 4 or rows > self.rows_per_strip:
+            raise ValueError("Every band but the last must have the same number of rows")
+        data = np.ascontiguousarray(band, dtype=np.uint8)
+        self._strips.append((self.f.tell() - self._start, data.nbytes))
+        self.f.write(data.data)
+        self.rows += rows
+
+    def close(self):
+        """Write the directory of the image, every row must have been written"""
+        if self.rows != self.height:
+            raise ValueError(f"Only {self.rows} of {self.height} rows were written")
+        f = self.f
+        # the directory starts on a word boundary
+        if (f.tell() - self._start) % 2:
+            f.write(b"\x00")
+
+        n = len(self._strips)
+        tags = 14
+        directory = f.tell() - self._start
+        # the values that don't fit in the four bytes of an entry follow the directory
+        extra = directory + 2 + tags * 12 + 4
+        bits = extra
+        resolution = bits + 8
+        offsets = resolution + 8
+        counts = offsets + (4 * n if n > 1 else 0)
+
+        def entry(tag, kind, count, value):
+            # kind 3 is SHORT, 4 is LONG, 5 is RATIONAL
+            if kind == 3 and count == 1:
+                return struct.pack("<HHIHH", tag, kind, count, value, 0)
+            return struct.pack("<HHII", tag, kind, count, value)
+
+        entries = [
+            entry(256, 4, 1, self.width),  # ImageWidth
+            entry(257, 4, 1, self.height),  # ImageLength
+            entry(258, 3, 4, bits),  # BitsPerSample
+            entry(259, 3, 1, 1),  # Compression, none
+            entry(262, 3, 1, 2),  # PhotometricInterpretation, RGB
+            entry(273, 4, n, offsets if n > 1 else self._strips[0][0]),  # StripOffsets
+            entry(277, 3, 1, 4),  # SamplesPerPixel
+            entry(278, 4, 1, self.rows_per_strip),  # RowsPerStrip
+            entry(279, 4, n, counts if n > 1 else self._strips[0][1]),  # StripByteCounts
+            entry(282, 5, 1, resolution),  # XResolution
+            entry(283, 5, 1, resolution),  # YResolution
+            entry(284, 3, 1, 1),  # PlanarConfiguration, chunky
+            entry(296, 3, 1, 2),  # ResolutionUnit, inch
+            entry(338, 3, 1, 2),  # ExtraSamples, unassociated alpha
+        ]
+        f.write(struct.pack("<H", tags) + b"".join(entries) + struct.pack("<I", 0))
+        f.write(struct.pack("<4H", 8, 8, 8, 8))
+        # dpi as a fraction with a denominator of 100
+        f.write(struct.pack("<II", round(self.dpi * 100), 100))
+        if n > 1:
+            f.write(struct.pack(f"<{n}I", *(offset for offset, _ in self._strips)))
+            f.write(struct.pack(f"<{n}I", *(count for _, count in self._strips)))
+
+        end = f.tell()
+        f.seek(self._start + 4)
+        f.write(struct.pack("<I", directory))
+        f.seek(end)
+
+
+# the writer for each extension a graph can be saved in bands as
+writers = {
+    ".png": PngWriter,
+    ".tif": TiffWriter,
+    ".tiff": TiffWriter,
+}